@@ -0,0 +1,94 @@
+"""
+Stand-in for the yt-dlp executable used by the benchmarks
+
+Answers the subset of yt-dlp options yt-x uses with generated entries,
+so yt-x's own overhead can be measured without the network.
+
+The number of entries comes from an ``n=`` query parameter in the URL,
+falling back to YTX_FAKE_ENTRIES. YTX_FAKE_LATENCY delays the first
+output by that many seconds, like an extraction would.
+"""
+
+import json
+import os
+import sys
+import time
+import urllib.parse
+
+
+VERSION = "2024.08.06"
+
+
+def make_entry(index: int) -> dict:
+    """Build a flat entry shaped like yt-dlp's YouTube output"""
+    video_id = f"{index:011d}"[-11:]
+    return {
+        "_type": "url",
+        "ie_key": "Youtube",
+        "id": video_id,
+        "url": f"https://www.youtube.com/watch?v={video_id}",
+        "title": f"Benchmark video {index} about topic {index % 97}",
+        "description": f"Description for benchmark video {index}. " * 3,
+        "duration": 60 + index % 3600,
+        "channel_id": f"UC{index % 500:022d}",
+        "channel": f"Channel {index % 500}",
+        "channel_url": f"https://www.youtube.com/channel/UC{index % 500:022d}",
+        "uploader": f"Channel {index % 500}",
+        "view_count": index * 37,
+        "thumbnails": [
+            {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg", "height": 270, "width": 480},
+        ],
+    }
+
+
+def option(args: list, name: str, default=None):
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+
+def main():
+    args = sys.argv[1:]
+
+    if "--version" in args:
+        print(VERSION)
+        return 0
+
+    url = next((arg for arg in args if "://" in arg or arg.startswith("ytsearch")), "")
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+    count = int(query.get("n", [os.environ.get("YTX_FAKE_ENTRIES", "100")])[0])
+
+    time.sleep(float(os.environ.get("YTX_FAKE_LATENCY", "0")))
+
+    if "--get-url" in args:
+        expire = int(time.time()) + 6 * 60 * 60
+        print(f"https://rr1---sn-fake.googlevideo.com/videoplayback?expire={expire}&id={abs(hash(url))}")
+        return 0
+
+    start = int(option(args, "--playlist-start", 1))
+    end = min(int(option(args, "--playlist-end", count)), count)
+    indexes = range(start, end + 1)
+
+    out = sys.stdout
+    if "-j" in args:
+        for index in indexes:
+            out.write(json.dumps(make_entry(index)))
+            out.write("\n")
+    elif "-J" in args:
+        json.dump({
+            "_type": "playlist",
+            "id": "PLbenchmark",
+            "title": "Benchmark playlist",
+            "webpage_url": url,
+            "entries": [make_entry(index) for index in indexes],
+        }, out)
+        out.write("\n")
+    else:
+        print(f"ERROR: unsupported arguments {args}", file=sys.stderr)
+        return 2
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
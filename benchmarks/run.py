@@ -0,0 +1,287 @@
+"""
+Benchmarks for yt-x's own overhead
+
+Runs yt-x against benchmarks/fake_yt_dlp.py instead of the real yt-dlp,
+in a throwaway config/cache/data directory, and writes the timings as
+JSON so runs can be compared across commits.
+
+Usage:
+    python benchmarks/run.py [--sizes 10,1000,50000] [--repeat 3]
+                             [--latency 0] [--output results.json]
+                             [--only fetch,list,config,player]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+
+ROOT = Path(__file__).resolve().parent.parent
+FAKE_YT_DLP = Path(__file__).resolve().parent / "fake_yt_dlp.py"
+
+BENCHMARKS = ("fetch", "list", "config", "player")
+
+
+def setup_environment(work_dir: Path, latency: float):
+    """Point yt-x at a fresh home and put the fake yt-dlp first on PATH"""
+    bin_dir = work_dir / "bin"
+    bin_dir.mkdir()
+
+    if os.name == "nt":
+        shim = bin_dir / "yt-dlp.bat"
+        shim.write_text(f'@"{sys.executable}" "{FAKE_YT_DLP}" %*\n')
+    else:
+        shim = bin_dir / "yt-dlp"
+        shim.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_YT_DLP}" "$@"\n')
+        shim.chmod(0o755)
+
+    os.environ["PATH"] = str(bin_dir) + os.pathsep + os.environ.get("PATH", "")
+    os.environ["YTX_FAKE_LATENCY"] = str(latency)
+
+    # platformdirs honors these on Linux; APPDATA/LOCALAPPDATA on Windows
+    for name in ("XDG_CONFIG_HOME", "XDG_CACHE_HOME", "XDG_DATA_HOME", "APPDATA", "LOCALAPPDATA"):
+        os.environ[name] = str(work_dir / name.lower())
+
+    sys.path.insert(0, str(ROOT))
+
+
+def fake_url(size: int) -> str:
+    return f"https://www.youtube.com/playlist?list=PLbenchmark&n={size}"
+
+
+def measure(fn: Callable[[], object], repeat: int) -> List[float]:
+    """Time fn() `repeat` times"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def record(name: str, params: Dict, timings: List[float], **extra) -> Dict:
+    """Build one result record; times are in seconds"""
+    result = {
+        "name": name,
+        "params": params,
+        "repeat": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "max": max(timings),
+    }
+    result.update(extra)
+    return result
+
+
+def bench_fetch(config, sizes: List[int], repeat: int) -> List[Dict]:
+    """YTDLP.fetch_json, fetch_playlist and stream_playlist"""
+    from yt_x.ytdlp import YTDLP
+
+    ytdlp = YTDLP(config)
+    results = []
+
+    for size in sizes:
+        url = fake_url(size)
+        params = {"entries": size}
+
+        results.append(record(
+            "ytdlp.fetch_json.cold", params,
+            measure(lambda: ytdlp.fetch_json(url, refresh=True), repeat)
+        ))
+        results.append(record(
+            "ytdlp.fetch_json.cached", params,
+            measure(lambda: ytdlp.fetch_json(url), repeat)
+        ))
+        results.append(record(
+            "ytdlp.fetch_playlist.cold", params,
+            measure(lambda: ytdlp.fetch_playlist(url, refresh=True), repeat)
+        ))
+
+        first_entry = []
+
+        def stream():
+            started = time.perf_counter()
+            for i, _ in enumerate(ytdlp.stream_playlist(url, refresh=True)):
+                if i == 0:
+                    first_entry.append(time.perf_counter() - started)
+
+        timings = measure(stream, repeat)
+        results.append(record(
+            "ytdlp.stream_playlist.cold", params, timings,
+            first_entry_median=statistics.median(first_entry) if first_entry else None
+        ))
+
+    return results
+
+
+def bench_list(config, sizes: List[int], repeat: int) -> List[Dict]:
+    """VideoListScreen population, from mount until the first page is in"""
+    from textual.widgets import DataTable
+
+    from yt_x.app import YTXApp
+    from yt_x.tui import VideoListScreen
+
+    page_size = int(config.get("LIST_PAGE_SIZE", 200))
+
+    async def run(size: int):
+        first_rows, page_loaded = [], []
+        app = YTXApp()
+        async with app.run_test(size=(120, 50)) as pilot:
+            for _ in range(repeat):
+                screen = VideoListScreen(app, "Benchmark", fake_url(size))
+                started = time.perf_counter()
+                await app.push_screen(screen)
+                table = screen.query_one("#video-table", DataTable)
+
+                while not table.row_count:
+                    await pilot.pause(0.001)
+                first_rows.append(time.perf_counter() - started)
+
+                while len(screen.videos) < min(size, page_size):
+                    await pilot.pause(0.001)
+                page_loaded.append(time.perf_counter() - started)
+
+                await app.pop_screen()
+        return first_rows, page_loaded
+
+    results = []
+    for size in sizes:
+        first_rows, page_loaded = asyncio.run(run(size))
+        results.append(record(
+            "tui.video_list.populate", {"entries": size}, page_loaded,
+            first_rows_median=statistics.median(first_rows)
+        ))
+    return results
+
+
+def bench_config(config, sizes: List[int], repeat: int) -> List[Dict]:
+    """Config search history and recent video operations"""
+    results = []
+    count = 1000
+
+    def add_searches():
+        for i in range(count):
+            config.add_search_history(f"benchmark query {i}")
+
+    def get_searches():
+        for _ in range(count):
+            config.get_search_history()
+
+    def add_recent():
+        for i in range(count):
+            config.add_recent_video({"id": f"{i:011d}", "title": f"Video {i}", "channel": "Channel"})
+
+    def get_recent():
+        for _ in range(count):
+            config.get_recent_videos()
+
+    for name, fn in (
+        ("config.add_search_history", add_searches),
+        ("config.get_search_history", get_searches),
+        ("config.add_recent_video", add_recent),
+        ("config.get_recent_videos", get_recent),
+    ):
+        results.append(record(name, {"calls": count}, measure(fn, repeat)))
+
+    return results
+
+
+def bench_player(config, sizes: List[int], repeat: int) -> List[Dict]:
+    """VLC playlist construction: stream URL resolution and m3u8 writing"""
+    from yt_x.cache import StreamURLCache
+    from yt_x.player import Player
+    from yt_x.ytdlp import YTDLP
+
+    config.config["PLAYER"] = "vlc"
+    ytdlp = YTDLP(config)
+    player = Player(config, ytdlp_instance=ytdlp)
+    results = []
+
+    # Every resolution spawns the fake yt-dlp, so keep these lists short
+    for size in sorted({min(size, 100) for size in sizes}):
+        urls = [f"https://www.youtube.com/watch?v={i:011d}" for i in range(size)]
+        titles = [f"Video {i}" for i in range(size)]
+        params = {"entries": size}
+
+        def resolve():
+            ytdlp.stream_cache = StreamURLCache()
+            list(player._resolve_playlist(urls))
+
+        results.append(record("player.resolve_playlist.cold", params, measure(resolve, repeat)))
+        results.append(record(
+            "player.resolve_playlist.cached", params,
+            measure(lambda: list(player._resolve_playlist(urls)), repeat)
+        ))
+        results.append(record(
+            "player.create_m3u8", params,
+            measure(lambda: player._create_m3u8_playlist(urls, titles, name="benchmark.m3u8"), repeat)
+        ))
+
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark yt-x against a fake yt-dlp")
+    parser.add_argument("--sizes", default="10,1000,50000", help="Comma separated entry counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the fake yt-dlp waits before output")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="Comma separated benchmark groups")
+    parser.add_argument("--output", help="Write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    groups = [group for group in args.only.split(",") if group]
+    unknown = set(groups) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark groups: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory(prefix="yt-x-bench-") as work_dir:
+        setup_environment(Path(work_dir), args.latency)
+
+        from yt_x.config import get_config
+        config = get_config()
+
+        results = []
+        for group in groups:
+            print(f"Running {group} benchmarks...", file=sys.stderr)
+            results.extend(globals()[f"bench_{group}"](config, sizes, args.repeat))
+
+        config.flush()
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "settings": {"sizes": sizes, "repeat": args.repeat, "latency": args.latency},
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
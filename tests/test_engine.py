@@ -0,0 +1,38 @@
+"""
+Tests for the in-process yt-dlp engine
+"""
+
+import pytest
+
+pytest.importorskip("yt_dlp")
+
+from yt_x.engine import InProcessEngine
+
+
+@pytest.fixture
+def engine():
+    engine = InProcessEngine()
+    yield engine
+    engine.close()
+
+
+def test_extract_invalid_url_raises(engine):
+    with pytest.raises(RuntimeError, match="notaurl"):
+        engine.extract("notaurl", [])
+
+
+def test_resolve_invalid_url_raises(engine):
+    with pytest.raises(RuntimeError, match="notaurl"):
+        engine.resolve_url("notaurl", ["-f", "best"])
+
+
+def test_iter_entries_invalid_url_raises(engine):
+    with pytest.raises(RuntimeError, match="notaurl"):
+        list(engine.iter_entries("notaurl", ["--flat-playlist"]))
+
+
+def test_instance_reused_after_error(engine):
+    with pytest.raises(RuntimeError):
+        engine.extract("notaurl", [])
+    with pytest.raises(RuntimeError, match="alsonotaurl"):
+        engine.extract("alsonotaurl", [])
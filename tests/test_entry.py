@@ -0,0 +1,35 @@
+"""
+Tests for compact video records
+"""
+
+from yt_x.entry import VideoEntry
+from yt_x.index import MAX_DESCRIPTION, VideoIndex
+
+
+def test_description_round_trips():
+    entry = VideoEntry.from_dict({"id": "abcdefghijk", "title": "Video", "description": " Recorded live \n"})
+
+    assert entry.description == "Recorded live"
+    assert VideoEntry.from_dict(entry.to_dict()).description == "Recorded live"
+
+
+def test_empty_description_is_left_out():
+    for description in (None, "", "  \n"):
+        entry = VideoEntry.from_dict({"id": "abcdefghijk", "title": "Video", "description": description})
+        assert entry.description is None
+        assert "description" not in entry.to_dict()
+
+
+def test_long_description_is_cut():
+    entry = VideoEntry.from_dict({"id": "abcdefghijk", "title": "Video", "description": "x" * 5000})
+
+    assert len(entry.description) == MAX_DESCRIPTION
+
+
+def test_saved_entry_is_searchable_by_description(tmp_path):
+    index = VideoIndex(tmp_path / "index.db")
+    entry = VideoEntry.from_dict({"id": "abcdefghijk", "title": "Video", "description": "Recorded live in Oslo"})
+
+    index.add_many([entry.to_dict()])
+
+    assert [result["id"] for result in index.search("oslo")] == ["abcdefghijk"]
@@ -0,0 +1,38 @@
+"""
+Tests for the yt-dlp helper process
+"""
+
+import pytest
+
+pytest.importorskip("yt_dlp")
+
+from yt_x.helper import HelperEngine
+
+
+@pytest.fixture
+def engine():
+    engine = HelperEngine()
+    yield engine
+    engine.close()
+
+
+def test_extract_error_is_raised(engine):
+    with pytest.raises(RuntimeError, match="'notaurl' is not a valid URL"):
+        engine.extract("notaurl", [])
+
+
+def test_resolve_error_is_raised(engine):
+    with pytest.raises(RuntimeError, match="'notaurl' is not a valid URL"):
+        engine.resolve_url("notaurl", [], timeout=30)
+
+
+def test_entries_error_is_raised(engine):
+    with pytest.raises(RuntimeError, match="'notaurl' is not a valid URL"):
+        list(engine.iter_entries("notaurl", ["--flat-playlist"]))
+
+
+def test_helper_survives_an_error(engine):
+    with pytest.raises(RuntimeError):
+        engine.extract("notaurl", [])
+    with pytest.raises(RuntimeError, match="alsonotaurl"):
+        engine.extract("alsonotaurl", [])
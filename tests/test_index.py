@@ -0,0 +1,33 @@
+"""
+Tests for the local full-text video index
+"""
+
+from yt_x.index import VideoIndex
+
+
+def make_entry(video_id, title, **fields):
+    return dict(id=video_id, title=title, url=f"https://www.youtube.com/watch?v={video_id}", **fields)
+
+
+def test_duplicate_ids_in_one_batch(tmp_path):
+    index = VideoIndex(tmp_path / "index.db")
+    index.add_many([
+        make_entry("abcdefghijk", "Lofi beats"),
+        make_entry("bcdefghijkl", "Jazz beats"),
+        make_entry("abcdefghijk", "Lofi beats to study to"),
+    ])
+
+    assert index.count() == 2
+    assert [entry["title"] for entry in index.search("lofi")] == ["Lofi beats to study to"]
+    # The repeated video counts as the most recently seen
+    assert [entry["id"] for entry in index.search("beats")] == ["abcdefghijk", "bcdefghijkl"]
+
+
+def test_seeing_a_video_again_replaces_it(tmp_path):
+    index = VideoIndex(tmp_path / "index.db")
+    index.add_many([make_entry("abcdefghijk", "Old title")])
+    index.add_many([make_entry("abcdefghijk", "New title", description="Live session")])
+
+    assert index.count() == 1
+    assert index.search("old") == []
+    assert index.search("session")[0]["title"] == "New title"
@@ -0,0 +1,57 @@
+"""
+Tests for the incremental yt-dlp JSON parser
+"""
+
+import io
+
+import pytest
+
+from yt_x.ingest import parse_info
+
+
+class ChunkedStream(io.RawIOBase):
+    """Returns the given chunks one read at a time, like a pipe"""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def read(self, size=-1):
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+@pytest.mark.parametrize("head, tail", [
+    (b"212.", b"5, "),
+    (b"21", b"2.5, "),
+    (b"2.125e", b"2, "),
+    (b"-", b"212.5, "),
+])
+def test_number_split_across_chunks(head, tail):
+    stream = ChunkedStream([
+        b'{"id": "abcdefghijk", "duration": ' + head,
+        tail + b'"title": "Video"}',
+    ])
+
+    info = parse_info(stream)
+
+    assert info["duration"] == float((head + tail).rstrip(b", "))
+    assert info["title"] == "Video"
+
+
+def test_number_at_end_of_stream():
+    stream = ChunkedStream([b'{"id": "abcdefghijk", "duration": 21', b"2}"])
+
+    assert parse_info(stream)["duration"] == 212
+
+
+def test_entries_are_slimmed():
+    stream = ChunkedStream([
+        b'{"_type": "playlist", "id": "PL", "formats": [1, 2], "entries": [',
+        b'{"id": "abcdefghijk", "title": "A", "formats": [1]}, null, ',
+        b'{"id": "bcdefghijkl", "title": "B"}]}',
+    ])
+
+    info = parse_info(stream)
+
+    assert "formats" not in info
+    assert [entry["id"] for entry in info["entries"]] == ["abcdefghijk", "bcdefghijkl"]
+    assert "formats" not in info["entries"][0]
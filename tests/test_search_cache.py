@@ -0,0 +1,65 @@
+"""
+Tests for search results streamed into the search result cache
+"""
+
+import pytest
+
+from yt_x.ytdlp import YTDLP
+
+RESULTS = [{"id": f"video{n:06d}", "title": f"Result {n}"} for n in range(1, 6)]
+
+
+class StubConfig:
+    """Just enough configuration for a YTDLP without caches or tracing"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.values = {"METADATA_CACHE": False, "TRACE_YTDLP": False}
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def index_entries(self, entries):
+        pass
+
+
+@pytest.fixture
+def ytdlp(tmp_path, monkeypatch):
+    monkeypatch.setattr(YTDLP, "_find_yt_dlp", lambda self: "yt-dlp")
+    ytdlp = YTDLP(StubConfig(tmp_path))
+    ytdlp.windows = []
+
+    def stream_lines(url, args):
+        start = int(args[args.index("--playlist-start") + 1])
+        end = int(args[args.index("--playlist-end") + 1])
+        ytdlp.windows.append(start)
+        yield from RESULTS[start - 1:end]
+
+    ytdlp._stream_lines = stream_lines
+    return ytdlp
+
+
+def test_every_window_is_cached(ytdlp):
+    assert list(ytdlp.stream_search("lofi", page_size=2)) == RESULTS
+
+    assert ytdlp.windows == [1, 3, 5]
+    assert ytdlp.search_cache.lookup("lofi") == (RESULTS, True)
+
+
+def test_search_continues_after_cached_results(ytdlp):
+    results = ytdlp.stream_search("lofi", page_size=2)
+    assert [next(results), next(results)] == RESULTS[:2]
+    results.close()
+    assert ytdlp.search_cache.lookup("  LOFI ") == (RESULTS[:2], False)
+
+    assert list(ytdlp.stream_search("lofi", start=3, page_size=2)) == RESULTS[2:]
+
+    assert ytdlp.windows == [1, 3, 5]
+    assert ytdlp.search_cache.lookup("lofi") == (RESULTS, True)
+
+
+def test_full_last_window_is_completed_by_an_empty_one(ytdlp):
+    list(ytdlp.stream_search("lofi", page_size=5))
+
+    assert ytdlp.windows == [1, 6]
+    assert ytdlp.search_cache.lookup("lofi") == (RESULTS, True)
@@ -0,0 +1,80 @@
+"""
+Tests for the thumbnail cache and fetcher
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from yt_x.thumbnails import ThumbnailCache, ThumbnailFetcher
+
+
+def age(cache, url, seconds):
+    """Make a cached image look last used `seconds` ago"""
+    path = cache.get(url)
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_eviction_drops_refs_to_evicted_images(tmp_path):
+    cache = ThumbnailCache(tmp_path, max_size=250)
+    cache.set("https://i.ytimg.com/vi/a/mqdefault.jpg", b"a" * 100)
+    cache.set("https://i.ytimg.com/vi/b/mqdefault.jpg", b"a" * 100)
+    cache.set("https://i.ytimg.com/vi/c/mqdefault.jpg", b"c" * 100)
+    age(cache, "https://i.ytimg.com/vi/c/mqdefault.jpg", 60)
+
+    cache.set("https://i.ytimg.com/vi/d/mqdefault.jpg", b"d" * 100)
+
+    assert cache.get("https://i.ytimg.com/vi/c/mqdefault.jpg") is None
+    assert len(os.listdir(cache.refs_dir)) == 3
+    # Both URLs of the shared image keep their ref
+    assert cache.get("https://i.ytimg.com/vi/a/mqdefault.jpg") == cache.get("https://i.ytimg.com/vi/b/mqdefault.jpg")
+
+
+def test_eviction_keeps_a_ref_stored_again_with_another_image(tmp_path):
+    cache = ThumbnailCache(tmp_path, max_size=250)
+    cache.set("https://i.ytimg.com/vi/a/mqdefault.jpg", b"a" * 100)
+    cache.set("https://i.ytimg.com/vi/b/mqdefault.jpg", b"b" * 100)
+    age(cache, "https://i.ytimg.com/vi/a/mqdefault.jpg", 120)
+    cache.set("https://i.ytimg.com/vi/c/mqdefault.jpg", b"c" * 100)
+
+    # Now a fresh image of a different size replaces the one evicted
+    cache.set("https://i.ytimg.com/vi/b/mqdefault.jpg", b"B" * 50)
+    age(cache, "https://i.ytimg.com/vi/c/mqdefault.jpg", 60)
+    cache.set("https://i.ytimg.com/vi/d/mqdefault.jpg", b"d" * 100)
+
+    assert cache.get("https://i.ytimg.com/vi/b/mqdefault.jpg").read_bytes() == b"B" * 50
+
+
+class StubConfig:
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def get(self, key, default=None):
+        return default
+
+
+def test_set_visible_leaves_cache_reads_to_workers(tmp_path):
+    pytest.importorskip("requests")
+    fetcher = ThumbnailFetcher(StubConfig(tmp_path), max_workers=1)
+    url = "https://i.ytimg.com/vi/a/mqdefault.jpg"
+    fetcher.cache.set(url, b"a" * 100)
+
+    readers = []
+    done = threading.Event()
+    get = fetcher.cache.get
+
+    def recording_get(url):
+        readers.append(threading.current_thread())
+        done.set()
+        return get(url)
+
+    fetcher.cache.get = recording_get
+    try:
+        fetcher.set_visible([url])
+        assert done.wait(5)
+        assert threading.current_thread() not in readers
+    finally:
+        fetcher.shutdown()
@@ -3,31 +3,16 @@ yt-x - Main entry point
 """
 
 import sys
-import subprocess
 
 def check_dependencies():
     """Check if required dependencies are installed"""
-    missing = []
-    
-    try:
-        import textual
-    except ImportError:
-        missing.append("textual")
-    
-    try:
-        import rich
-    except ImportError:
-        missing.append("rich")
-    
-    try:
-        import requests
-    except ImportError:
-        missing.append("requests")
-    
-    try:
-        import platformdirs
-    except ImportError:
-        missing.append("platformdirs")
+    # find_spec locates the packages without paying for importing them
+    from importlib.util import find_spec
+
+    missing = [
+        name for name in ("textual", "rich", "requests", "platformdirs")
+        if find_spec(name) is None
+    ]
     
     if missing:
         print("=" * 60)
@@ -55,44 +40,15 @@ def check_dependencies():
 
 def check_external_dependencies():
     """Check if external dependencies are installed"""
-    external_missing = []
-    
-    try:
-        result = subprocess.run(
-            ["yt-dlp", "--version"],
-            capture_output=True,
-            text=True,
-            shell=True
-        )
-        if result.returncode != 0:
-            external_missing.append("yt-dlp")
-    except:
-        external_missing.append("yt-dlp")
-    
-    try:
-        result = subprocess.run(
-            ["vlc", "--version"],
-            capture_output=True,
-            text=True,
-            shell=True
-        )
-        if result.returncode != 0:
-            external_missing.append("vlc")
-    except:
-        pass
-    
-    try:
-        result = subprocess.run(
-            ["mpv", "--version"],
-            capture_output=True,
-            text=True,
-            shell=True
-        )
-        if result.returncode != 0:
-            external_missing.append("mpv")
-    except:
-        pass
-    
+    from yt_x.config import get_config
+    from yt_x.executables import get_executable_cache
+
+    # Probes run concurrently and are cached per binary, so a normal
+    # launch does not spawn any process here
+    tools = ["yt-dlp", "vlc", "mpv"]
+    results = get_executable_cache(get_config().cache_dir).probe_all(tools)
+    external_missing = [tool for tool in tools if not results[tool]]
+
     if external_missing:
         print("=" * 60)
         print("WARNING: External Dependencies Not Found")
@@ -118,14 +74,18 @@ def check_external_dependencies():
 
 def main():
     """Main entry point with dependency checking"""
-    print("Starting yt-x...")
-    print()
+    # batch output is machine-read, so nothing else may go to stdout
+    if sys.argv[1:2] != ["batch"]:
+        print("Starting yt-x...")
+        print()
     
     if not check_dependencies():
         sys.exit(1)
     
-    check_external_dependencies()
-    print()
+    # Only the interactive UI needs the players; subcommands check for themselves
+    if not [arg for arg in sys.argv[1:] if arg != "--profile-startup"]:
+        check_external_dependencies()
+        print()
     
     try:
         from yt_x.cli import main as cli_main
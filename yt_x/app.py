@@ -2,12 +2,16 @@
 Main application class
 """
 
+import threading
+from typing import Iterator, List, Optional
+
+from textual import work
 from textual.app import App, ComposeResult
 from textual.screen import Screen
 
-from .config import Config
-from .ytdlp import YTDLP
-from .player import Player
+from . import profiling
+from .config import get_config
+from .entry import VideoEntry
 from .tui import (
     MainScreen,
     VideoListScreen,
@@ -15,6 +19,8 @@ from .tui import (
     SearchScreen,
     SavedVideosScreen,
     CustomPlaylistsScreen,
+    DownloadsScreen,
+    TraceSummaryScreen,
     ChannelsScreen,
     ConfigScreen,
     MiscScreen,
@@ -71,6 +77,8 @@ class YTXApp(App):
         "search": SearchScreen,
         "saved": SavedVideosScreen,
         "custom_playlists": CustomPlaylistsScreen,
+        "downloads": DownloadsScreen,
+        "trace": TraceSummaryScreen,
         "channels": ChannelsScreen,
         "config": ConfigScreen,
         "misc": MiscScreen,
@@ -78,30 +86,150 @@ class YTXApp(App):
 
     def __init__(self):
         super().__init__()
-        self.config = Config()
-        self.ytdlp = YTDLP(self.config)
-        self.player = Player(self.config, ytdlp_instance=self.ytdlp)
+        self.config = get_config()
+        # yt-dlp discovery and the helpers built on it are created on first
+        # use, so the first frame does not wait for them
+        self._services = {}
+        self._services_lock = threading.RLock()
+
+    def _service(self, name: str, factory):
+        """Get a shared helper, creating it on first use"""
+        with self._services_lock:
+            if name not in self._services:
+                self._services[name] = factory()
+            return self._services[name]
+
+    @property
+    def ytdlp(self):
+        def create():
+            from .ytdlp import YTDLP
+            return YTDLP(self.config)
+        return self._service("ytdlp", create)
+
+    @property
+    def player(self):
+        def create():
+            from .player import Player
+            return Player(self.config, ytdlp_instance=self.ytdlp)
+        return self._service("player", create)
+
+    @property
+    def subscription_sync(self):
+        def create():
+            from .subscriptions import SubscriptionSync
+            return SubscriptionSync(self.config, self.ytdlp)
+        return self._service("subscription_sync", create)
+
+    @property
+    def downloads(self):
+        def create():
+            from .downloads import DownloadQueue
+            return DownloadQueue(self.config, self.ytdlp)
+        return self._service("downloads", create)
+
+    @property
+    def thumbnails(self):
+        def create():
+            from .thumbnails import ThumbnailFetcher
+            return ThumbnailFetcher(
+                self.config,
+                max_workers=int(self.config.get("THUMBNAIL_WORKERS", 4))
+            )
+        return self._service("thumbnails", create)
 
     def on_mount(self) -> None:
-        self.push_screen("main")
-
-    def fetch_videos(self, url: str) -> list:
+        self.push_screen(MainScreen(self))
+        self.call_after_refresh(self._after_first_frame)
+
+    def _after_first_frame(self):
+        profiling.mark("first frame")
+        self._warm_up()
+
+    @work(thread=True)
+    def _warm_up(self):
+        """Find yt-dlp and resume downloads once the UI is showing"""
+        try:
+            self.ytdlp
+            profiling.mark("yt-dlp discovery")
+            # Resumes downloads left queued or interrupted by the last run
+            self.downloads.start()
+            profiling.mark("download queue")
+        except RuntimeError as e:
+            # Nothing works without yt-dlp, as before the UI was shown first
+            self.call_from_thread(self.exit, None, 1, str(e))
+            return
+
+        if profiling.enabled():
+            self.call_from_thread(self.exit)
+
+    def fetch_videos(self, url: str, refresh: bool = False) -> List[VideoEntry]:
         """Fetch videos from URL"""
-        data = self.ytdlp.fetch_json(url)
+        data = self.ytdlp.fetch_json(url, refresh=refresh)
         if data:
-            return data.get("entries", [])
+            return [VideoEntry.from_dict(entry) for entry in data.get("entries", [])]
         return []
 
+    def iter_videos(self, url: str, refresh: bool = False, page_size: Optional[int] = None) -> Iterator[VideoEntry]:
+        """Iterate over videos from URL as they become available, page_size at a time"""
+        for entry in self.ytdlp.stream_playlist(url, page_size=page_size, refresh=refresh):
+            yield VideoEntry.from_dict(entry)
+
+    def iter_subscription_feed(self, refresh: bool = False) -> Iterator[VideoEntry]:
+        """Iterate over the synced subscription feed, syncing first if needed"""
+        if refresh or not self.subscription_sync.get_feed(limit=1):
+            self.subscription_sync.sync()
+        for entry in self.subscription_sync.get_feed():
+            yield VideoEntry.from_dict(entry)
+
     def open_search_screen(self, title: str, url: str):
         """Open screen showing video list"""
         screen = VideoListScreen(self, title, url)
         self.push_screen(screen)
 
-    def open_video_actions(self, video: dict):
+    def open_search_results(self, query: str, filters: str = None):
+        """Open search results, reusing those already fetched for this query"""
+        url = self.ytdlp.search_url(query, filters)
+        page_size = int(self.config.get("LIST_PAGE_SIZE", 200))
+
+        def source(refresh: bool):
+            found = None if refresh else self.ytdlp.search_cache.lookup(query, filters)
+            cached, complete = found or ([], False)
+            for entry in cached:
+                yield VideoEntry.from_dict(entry)
+            if complete:
+                return
+
+            # Carry on past the cached results; each window is added to the cache
+            results = self.ytdlp.stream_search(
+                query, filters, start=len(cached) + 1, page_size=page_size, refresh=refresh
+            )
+            for entry in results:
+                yield VideoEntry.from_dict(entry)
+
+        self.push_screen(VideoListScreen(self, f"Search: {query}", url, source=source))
+
+    def open_subscription_feed(self):
+        """Open the subscription feed, built locally when subscriptions are known"""
+        if not self.config.get_subscriptions():
+            self.open_search_screen("Subscription Feed", "https://www.youtube.com/feed/subscriptions")
+            return
+
+        screen = VideoListScreen(
+            self,
+            "Subscription Feed",
+            "https://www.youtube.com/feed/subscriptions",
+            source=self.iter_subscription_feed
+        )
+        self.push_screen(screen)
+
+    def open_video_actions(self, video: VideoEntry):
         """Open video actions screen"""
         screen = VideoActionsScreen(self, video)
         self.push_screen(screen)
 
     def action_quit(self) -> None:
         """Quit the application"""
+        for name in ("downloads", "thumbnails"):
+            if name in self._services:
+                self._services[name].shutdown()
         self.exit()
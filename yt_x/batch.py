@@ -0,0 +1,182 @@
+"""
+Non-interactive batch mode: yt-x batch
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, Optional, Set, TextIO, Tuple
+
+
+def is_url(text: str) -> bool:
+    """Tell URLs (and yt-dlp search prefixes) from search queries"""
+    return "://" in text or text.startswith("ytsearch")
+
+
+def read_items(stream: TextIO) -> Iterator[Tuple[int, str]]:
+    """
+    Read batch items, one per line
+
+    Blank lines and lines starting with # are skipped.
+
+    Yields:
+        Tuples of (line number, item)
+    """
+    for number, line in enumerate(stream, 1):
+        item = line.strip()
+        if item and not item.startswith("#"):
+            yield number, item
+
+
+class BatchRunner:
+    """Resolves batch items concurrently and writes one JSON line per item
+
+    Lines are written as items finish, so their order is not the input
+    order; each carries the input line number. A failing item is
+    reported on its own line and the run continues.
+    """
+
+    def __init__(
+        self,
+        ytdlp,
+        output: TextIO,
+        workers: int = 8,
+        streams: bool = False,
+        quality: Optional[int] = None,
+        audio_only: bool = False,
+        max_results: int = 10,
+        refresh: bool = False
+    ):
+        self.ytdlp = ytdlp
+        self.output = output
+        self.workers = max(1, workers)
+        self.streams = streams
+        self.quality = quality
+        self.audio_only = audio_only
+        self.max_results = max_results
+        self.refresh = refresh
+        self.done = 0
+        self.failed = 0
+
+    def process(self, line: int, item: str) -> Dict:
+        """Resolve one item into its output record"""
+        started = time.perf_counter()
+        record = {"line": line, "input": item}
+        try:
+            if is_url(item):
+                record["kind"] = "url"
+                data = self.ytdlp.fetch_json(item, refresh=self.refresh, raise_errors=True)
+                if data is None:
+                    raise RuntimeError("No data returned")
+                record["data"] = data
+                # Stream URLs only make sense for single videos
+                if self.streams and "entries" not in data:
+                    record["stream_url"] = self.ytdlp.get_video_url(
+                        item, self.quality, self.audio_only, timeout=60, raise_errors=True
+                    )
+            else:
+                record["kind"] = "search"
+                results = self.ytdlp.search(
+                    item, max_results=self.max_results, refresh=self.refresh, raise_errors=True
+                )
+                if results is None:
+                    raise RuntimeError("No data returned")
+                record["results"] = results
+            record["ok"] = True
+        except Exception as e:
+            record["ok"] = False
+            record["error"] = str(e).strip() or type(e).__name__
+        record["elapsed"] = round(time.perf_counter() - started, 3)
+        return record
+
+    def write(self, record: Dict):
+        self.output.write(json.dumps(record) + "\n")
+        self.output.flush()
+        self.done += 1
+        if not record["ok"]:
+            self.failed += 1
+
+    def run(self, items: Iterator[Tuple[int, str]]):
+        """Process all items, keeping at most twice `workers` of them queued"""
+        pending: Set[Future] = set()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="yt-x-batch") as executor:
+            for line, item in items:
+                pending.add(executor.submit(self.process, line, item))
+                if len(pending) >= 2 * self.workers:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        self.write(future.result())
+
+            for future in wait(pending).done:
+                self.write(future.result())
+
+
+def build_parser(default_workers: int) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="yt-x batch",
+        description="Resolve URLs and search queries without the UI, one JSON line per item"
+    )
+    parser.add_argument("file", nargs="?", default="-", help="File with one URL or query per line (default: stdin)")
+    parser.add_argument("-w", "--workers", type=int, default=default_workers, help="Items resolved at once")
+    parser.add_argument("--streams", action="store_true", help="Also resolve direct stream URLs of videos")
+    parser.add_argument("--quality", type=int, help="Maximum stream height, e.g. 1080")
+    parser.add_argument("--audio-only", action="store_true", help="Resolve audio stream URLs")
+    parser.add_argument("--max-results", type=int, default=10, help="Results per search query")
+    parser.add_argument("--refresh", action="store_true", help="Bypass the metadata cache")
+    return parser
+
+
+def run_batch(args: list) -> int:
+    """
+    Run yt-x batch
+
+    Args:
+        args: Arguments after "batch"
+
+    Returns:
+        Exit status: 0 if every item succeeded, 1 if any failed, 2 on setup errors
+    """
+    from .config import get_config
+    from .ytdlp import YTDLP
+
+    config = get_config()
+    options = build_parser(int(config.get("BATCH_WORKERS", 8))).parse_args(args)
+    output = sys.stdout
+
+    # Records are the only thing on stdout; messages from yt-x go to stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            ytdlp = YTDLP(config)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return 2
+
+        runner = BatchRunner(
+            ytdlp,
+            output,
+            workers=options.workers,
+            streams=options.streams,
+            quality=options.quality,
+            audio_only=options.audio_only,
+            max_results=options.max_results,
+            refresh=options.refresh
+        )
+
+        if options.file == "-":
+            source = contextlib.nullcontext(sys.stdin)
+        else:
+            try:
+                source = open(options.file, "r", encoding="utf-8")
+            except OSError as e:
+                print(f"Error reading {options.file}: {e}")
+                return 2
+
+        with source as stream:
+            runner.run(read_items(stream))
+
+        print(f"{runner.done} items, {runner.failed} failed")
+
+    return 1 if runner.failed else 0
@@ -0,0 +1,437 @@
+"""
+Persistent metadata cache for yt-dlp results
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Time-to-live in seconds per URL class
+TTLS = {
+    "trending": 10 * 60,
+    "feed": 5 * 60,
+    "library": 5 * 60,
+    "search": 30 * 60,
+    "channel": 60 * 60,
+    "playlist": 6 * 60 * 60,
+    "video": 24 * 60 * 60,
+    "other": 60 * 60,
+}
+
+
+def classify_url(url: str) -> str:
+    """
+    Classify a URL for cache lifetime purposes
+
+    Returns:
+        One of the keys of TTLS
+    """
+    url = url.lower()
+
+    if "/feed/trending" in url:
+        return "trending"
+    if "/feed/" in url or url.rstrip("/") in ("https://www.youtube.com", "https://youtube.com"):
+        return "feed"
+    if "list=wl" in url or "list=ll" in url:
+        return "library"
+    if "/results?" in url or url.startswith("ytsearch"):
+        return "search"
+    if "list=" in url:
+        return "playlist"
+    if "watch?v=" in url or "youtu.be/" in url or "/shorts/" in url:
+        return "video"
+    if any(part in url for part in ("/@", "/channel/", "/c/", "/user/")):
+        return "channel"
+    return "other"
+
+
+def video_id_from_url(url: str) -> str:
+    """
+    Get the YouTube video ID from a URL
+
+    Returns:
+        The video ID, or the URL itself for other sites
+    """
+    parsed = urllib.parse.urlparse(url)
+    if parsed.hostname == "youtu.be":
+        return parsed.path.lstrip("/") or url
+
+    video_id = urllib.parse.parse_qs(parsed.query).get("v")
+    if video_id:
+        return video_id[0]
+
+    match = re.search(r"/(?:shorts|embed|live)/([\w-]{11})", parsed.path)
+    if match:
+        return match.group(1)
+
+    return url
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so trivially different spellings share results"""
+    return " ".join(query.split()).casefold()
+
+
+def stream_url_expiry(url: str) -> Optional[float]:
+    """Get the expiry timestamp of a signed stream URL, if it has one"""
+    # googlevideo URLs carry it as ?expire=... or /expire/.../ for manifests
+    match = re.search(r"[?&/]expire[=/](\d+)", url)
+    return float(match.group(1)) if match else None
+
+
+class MetadataCache:
+    """Compressed on-disk cache with per-URL-class TTLs and LRU eviction
+
+    The total size is counted once and then kept up to date on each
+    write, so the directory is only scanned again when it goes over
+    max_size. Eviction then frees a little more than needed, so the
+    following writes do not each trigger another scan.
+    """
+
+    # Eviction stops once the cache is down to this share of max_size
+    EVICT_TARGET = 0.9
+
+    def __init__(self, cache_dir: Path, max_size: int):
+        self.cache_dir = Path(cache_dir) / "metadata"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, url: str, args: List[str]) -> Path:
+        """Get cache file path for a request"""
+        key = hashlib.sha1("\0".join([url] + list(args)).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json.gz"
+
+    def get(self, url: str, args: List[str]) -> Optional[Any]:
+        """
+        Get cached data
+
+        Args:
+            url: Requested URL
+            args: yt-dlp arguments used for the request
+
+        Returns:
+            Cached data, or None if missing or expired
+        """
+        path = self._path(url, args)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            record = json.loads(gzip.decompress(raw))
+        except (OSError, ValueError):
+            return None
+
+        if record.get("expires_at", 0) < time.time():
+            try:
+                path.unlink()
+                self._track(-len(raw))
+            except OSError:
+                pass
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return record.get("data")
+
+    def set(self, url: str, args: List[str], data: Any):
+        """
+        Store data in the cache
+
+        Args:
+            url: Requested URL
+            args: yt-dlp arguments used for the request
+            data: JSON serializable data
+        """
+        path = self._path(url, args)
+        record = {
+            "url": url,
+            "expires_at": time.time() + TTLS[classify_url(url)],
+            "data": data,
+        }
+
+        payload = gzip.compress(json.dumps(record).encode("utf-8"), compresslevel=5)
+        try:
+            old_size = path.stat().st_size
+        except OSError:
+            old_size = 0
+
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing cache: {e}")
+            return
+
+        self._track(len(payload) - old_size)
+
+    def _scan(self) -> List[Tuple[float, int, str]]:
+        """List cache files as (mtime, size, path)"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _track(self, delta: int):
+        """Apply a change to the total size, evicting once over the cap"""
+        with self._lock:
+            if self._size is None:
+                # First change: count what is on disk, which includes it
+                self._size = sum(size for _, size, _ in self._scan())
+            else:
+                self._size += delta
+
+            if self._size > self.max_size:
+                self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until under the size cap"""
+        # Rescanned so files written by other yt-x processes are counted too
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+
+        target = self.max_size * self.EVICT_TARGET
+        entries.sort()
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+
+        self._size = total
+
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            for entry in os.scandir(self.cache_dir):
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+            self._size = 0
+
+
+class StreamURLCache:
+    """In-memory cache of resolved stream URLs that honors their expiry"""
+
+    # Drop entries this many seconds before the URL stops working
+    EXPIRY_MARGIN = 5 * 60
+    # Lifetime for URLs without an expire parameter
+    DEFAULT_TTL = 10 * 60
+    MAX_ENTRIES = 500
+
+    def __init__(self):
+        self._entries: Dict[Tuple, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: str, format_selector: str, audio_only: bool) -> Tuple:
+        return (video_id_from_url(url), format_selector, audio_only)
+
+    def get(self, url: str, format_selector: str, audio_only: bool) -> Optional[str]:
+        """Get a resolved URL if it is still valid"""
+        key = self._key(url, format_selector, audio_only)
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            return entry[0]
+
+    def set(self, url: str, format_selector: str, audio_only: bool, stream_url: str):
+        """Store a resolved URL until shortly before it expires"""
+        expiry = stream_url_expiry(stream_url)
+        if expiry:
+            valid_until = expiry - self.EXPIRY_MARGIN
+        else:
+            valid_until = time.time() + self.DEFAULT_TTL
+
+        if valid_until <= time.time():
+            return
+
+        with self._lock:
+            self._entries[self._key(url, format_selector, audio_only)] = (stream_url, valid_until)
+            if len(self._entries) > self.MAX_ENTRIES:
+                self._prune()
+
+    def _prune(self):
+        """Remove expired entries, then the ones closest to expiring"""
+        now = time.time()
+        for key in [k for k, (_, until) in self._entries.items() if until <= now]:
+            del self._entries[key]
+
+        if len(self._entries) > self.MAX_ENTRIES:
+            ordered = sorted(self._entries.items(), key=lambda item: item[1][1])
+            for key, _ in ordered[:len(self._entries) - self.MAX_ENTRIES]:
+                del self._entries[key]
+
+
+class SearchResultCache:
+    """In-memory LRU cache of search results
+
+    Streamed results are stored a window at a time, so a stored list may
+    stop short of the end of the results; ``lookup`` tells the two apart.
+    """
+
+    MAX_ENTRIES = 100
+
+    def __init__(self, ttl: float = TTLS["search"]):
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[List[Dict], bool, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(query: str, filters: Optional[str]) -> Tuple:
+        return (normalize_query(query), filters or "")
+
+    def get(self, query: str, filters: Optional[str] = None) -> Optional[List[Dict]]:
+        """Get results for a query if they are still fresh"""
+        found = self.lookup(query, filters)
+        return found[0] if found else None
+
+    def lookup(self, query: str, filters: Optional[str] = None) -> Optional[Tuple[List[Dict], bool]]:
+        """Get fresh results for a query and whether they run to the end"""
+        key = self._key(query, filters)
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            if entry[2] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0], entry[1]
+
+    def set(self, query: str, filters: Optional[str], entries: List[Dict], complete: bool = True):
+        """Store results, evicting the least recently used query if full"""
+        key = self._key(query, filters)
+        with self._lock:
+            self._entries[key] = (entries, complete, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+
+class _Flight:
+    """One call in progress, shared by everyone asking for its key"""
+
+    __slots__ = ("done", "result", "error", "cancelled")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.cancelled = False
+
+
+class SingleFlight:
+    """Shares one in-flight call between concurrent callers with the same key
+
+    The first caller for a key runs the call. Callers arriving while it
+    runs wait for it and get the same result, or the same exception. If
+    the first caller was cancelled, a waiting caller runs the call
+    itself instead of returning a result it did not ask to give up.
+    """
+
+    CANCEL_POLL = 0.1
+
+    def __init__(self):
+        self._flights: Dict[Tuple, _Flight] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def do(
+        self,
+        op: str,
+        key: Tuple,
+        fn: Callable[[], Any],
+        cancel: Optional[threading.Event] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Run fn, or wait for the identical call already running
+
+        Args:
+            op: Operation name the counters are kept under
+            key: Normalized identity of the call
+            fn: Does the work when no identical call is running
+            cancel: Stops waiting for another caller's call when set
+
+        Returns:
+            Tuple of (result, shared); shared is True if another
+            caller's call supplied the result. The result is None if
+            cancel was set while waiting.
+        """
+        key = (op,) + tuple(key)
+        counted = False
+
+        while True:
+            with self._lock:
+                counters = self._counters.setdefault(op, {"calls": 0, "shared": 0})
+                if not counted:
+                    counters["calls"] += 1
+                    counted = True
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+
+            if leader:
+                try:
+                    flight.result = fn()
+                    return flight.result, False
+                except BaseException as e:
+                    flight.error = e
+                    raise
+                finally:
+                    flight.cancelled = bool(cancel and cancel.is_set())
+                    with self._lock:
+                        del self._flights[key]
+                    flight.done.set()
+
+            while not flight.done.wait(self.CANCEL_POLL if cancel else None):
+                if cancel.is_set():
+                    return None, False
+
+            if flight.cancelled:
+                continue
+
+            with self._lock:
+                counters["shared"] += 1
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+    def counters(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get per-operation counts
+
+        Returns:
+            Mapping of operation to {"calls", "shared"}; shared calls
+            are the ones that did not start yt-dlp themselves
+        """
+        with self._lock:
+            return {op: dict(counts) for op, counts in self._counters.items()}
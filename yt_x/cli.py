@@ -4,10 +4,8 @@ Main entry point
 """
 
 import sys
-import webbrowser
-from pathlib import Path
 
-from .app import YTXApp
+from . import profiling
 
 
 def print_header():
@@ -33,111 +31,69 @@ Options:
   -c, --config            Edit configuration file
   -v, --version           Show version information
   -h, --help              Show this help message
+  deps [--refresh]        Check external dependencies
+  batch [file] [options]  Resolve URLs and queries from a file or stdin,
+                          printing one JSON line per item (see batch -h)
+  --profile-startup       Print an import and startup phase breakdown
+                          (with no other option, exits once the UI is ready)
 
 Examples:
   yt-x                    Launch interactive UI
   yt-x -s "funny cats"  Search for funny cats
   yt-x -u <url>          Open specific video/playlist
+  yt-x batch urls.txt --streams --workers 16 > results.jsonl
 
 For more information, visit: https://github.com/pinakdhabu/yt-x
     """)
 
 
-def check_dependencies():
-    """Check if required dependencies are installed"""
-    import subprocess
-
-    print("Checking dependencies...")
-
-    # Check yt-dlp
-    try:
-        result = subprocess.run(
-            ["yt-dlp", "--version"],
-            capture_output=True,
-            text=True,
-            shell=True
-        )
-        if result.returncode == 0:
-            print("  ✓ yt-dlp found")
-        else:
-            print("  ✗ yt-dlp not found")
-            return False
-    except:
-        print("  ✗ yt-dlp not found")
-        return False
+# External tools and whether yt-x needs them to work
+DEPENDENCIES = [
+    ("yt-dlp", True),
+    ("jq", False),
+    ("fzf", False),
+    ("mpv", False),
+    ("vlc", False),
+]
 
-    # Check jq
-    try:
-        result = subprocess.run(
-            ["jq", "--version"],
-            capture_output=True,
-            text=True,
-            shell=True
-        )
-        if result.returncode == 0:
-            print("  ✓ jq found")
-        else:
-            print("  ! jq not found (optional)")
-    except:
-        print("  ! jq not found (optional)")
 
-    # Check fzf
-    try:
-        result = subprocess.run(
-            ["fzf", "--version"],
-            capture_output=True,
-            text=True,
-            shell=True
-        )
-        if result.returncode == 0:
-            print("  ✓ fzf found")
-        else:
-            print("  ! fzf not found (optional)")
-    except:
-        print("  ! fzf not found (optional)")
+def check_dependencies(refresh: bool = False):
+    """Check if required dependencies are installed"""
+    from .config import get_config
+    from .executables import get_executable_cache
 
-    # Check mpv
-    try:
-        result = subprocess.run(
-            ["mpv", "--version"],
-            capture_output=True,
-            text=True,
-            shell=True
-        )
-        if result.returncode == 0:
-            print("  ✓ mpv found")
-        else:
-            print("  ! mpv not found (optional)")
-    except:
-        print("  ! mpv not found (optional)")
+    print("Checking dependencies...")
 
-    # Check vlc
-    try:
-        result = subprocess.run(
-            ["vlc", "--version"],
-            capture_output=True,
-            text=True,
-            shell=True
-        )
-        if result.returncode == 0:
-            print("  ✓ vlc found")
+    config = get_config()
+    results = get_executable_cache(config.cache_dir).probe_all(
+        [name for name, _ in DEPENDENCIES],
+        refresh=refresh
+    )
+
+    ok = True
+    for name, required in DEPENDENCIES:
+        info = results[name]
+        if info:
+            version = f" ({info['version']})" if info.get("version") else ""
+            print(f"  ✓ {name} found{version}")
+        elif required:
+            print(f"  ✗ {name} not found")
+            ok = False
         else:
-            print("  ! vlc not found (optional)")
-    except:
-        print("  ! vlc not found (optional)")
+            print(f"  ! {name} not found (optional)")
 
     print("\nRequired: yt-dlp")
     print("Optional: jq, fzf, mpv, vlc")
     print("")
 
-    return True
+    return ok
 
 
 def edit_config():
     """Open configuration file in editor"""
-    from .config import Config
+    from .config import get_config
 
-    config = Config()
+    config = get_config()
 
     # Try to open in default editor
     import subprocess
@@ -157,10 +113,10 @@ def edit_config():
 
 def direct_search(query: str):
     """Perform direct search and open first result"""
-    from .config import Config
+    from .config import get_config
     from .ytdlp import YTDLP
 
-    config = Config()
+    config = get_config()
     ytdlp = YTDLP(config)
 
     print(f"Searching for: {query}")
@@ -186,6 +142,8 @@ def direct_search(query: str):
 
 def open_url(url: str):
     """Open specific URL"""
+    import webbrowser
+
     print(f"Opening URL: {url}")
     webbrowser.open(url)
 
@@ -197,16 +155,33 @@ def main():
     # Parse command line arguments
     args = sys.argv[1:]
 
+    if "--profile-startup" in args:
+        args.remove("--profile-startup")
+        profiling.enable()
+
+    try:
+        run(args)
+    finally:
+        profiling.mark("done")
+        profiling.report()
+
+
+def run(args: list):
+    """Run the command given by the arguments"""
     if len(args) == 0:
         # Launch GUI
+        from .app import YTXApp
+        profiling.mark("imports")
+
         app = YTXApp()
+        profiling.mark("app init")
         app.run()
     elif args[0] in ["-h", "--help"]:
         print_usage()
     elif args[0] in ["-v", "--version"]:
-        from . import __version__
-        print(f"yt-x v{__version__.__version__}")
-        print(f"Copyright © 2024 {__version__.__author__}")
+        from . import __author__, __version__
+        print(f"yt-x v{__version__}")
+        print(f"Copyright © 2024 {__author__}")
     elif args[0] in ["-c", "--config"]:
         edit_config()
     elif args[0] in ["-s", "--search"]:
@@ -224,7 +199,10 @@ def main():
             print("Error: URL required")
             print_usage()
     elif args[0] == "deps":
-        check_dependencies()
+        check_dependencies(refresh="--refresh" in args[1:])
+    elif args[0] == "batch":
+        from .batch import run_batch
+        sys.exit(run_batch(args[1:]))
     else:
         print(f"Unknown option: {args[0]}")
         print_usage()
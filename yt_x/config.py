@@ -2,15 +2,31 @@
 Configuration management for yt-x
 """
 
+import atexit
 import json
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 from platformdirs import PlatformDirs
 
+from .entry import VideoEntry
+
 
 class Config:
-    """Manages application configuration for yt-x"""
+    """Manages application configuration for yt-x
+
+    set() only marks a key as changed; changes are written together
+    SAVE_DELAY seconds later, or at exit. Writes re-read the file first
+    if another process changed it, so only the keys changed here
+    override what is on disk. get() picks up changes made by others,
+    checking the file's mtime at most every RELOAD_INTERVAL seconds.
+    Use get_config() to share one instance per process.
+    """
+
+    SAVE_DELAY = 0.5
+    RELOAD_INTERVAL = 1.0
 
     def __init__(self):
         self.dirs = PlatformDirs(appname="yt-x", appauthor="pinakdhabu")
@@ -31,6 +47,18 @@ class Config:
         self.custom_playlists_file = self.data_dir / "custom_playlists.json"
         self.subscriptions_file = self.data_dir / "subscriptions.json"
         self.custom_commands_file = self.data_dir / "custom_commands.json"
+        self.library_db_file = self.data_dir / "library.db"
+        self.index_db_file = self.data_dir / "index.db"
+        self._store = None
+        self._index = None
+
+        self._lock = threading.RLock()
+        # Keys set since the last save, applied over the file on write
+        self._dirty: Dict[str, Any] = {}
+        self._save_timer: Optional[threading.Timer] = None
+        self._mtime: Optional[int] = None
+        self._checked_at = 0.0
+        atexit.register(self.flush)
 
         # Default configuration
         self.defaults = {
@@ -53,144 +81,198 @@ class Config:
             "WELCOME_SCREEN": True,
             "ROFI_THEME": "",
             "AUTO_LOADED_EXTENSIONS": "",
+            "YTDLP_ENGINE": "subprocess",
+            "METADATA_CACHE": True,
+            "METADATA_CACHE_SIZE_MB": 100,
+            "PREFETCH_STREAMS": True,
+            "PREFETCH_AHEAD": 2,
+            "PREFETCH_DWELL": 0.4,
+            "PREFETCH_WORKERS": 2,
+            "PLAYLIST_RESOLVE_WORKERS": 8,
+            "PLAYLIST_START_AFTER": 3,
+            "PLAYLIST_ENQUEUE_BATCH": 10,
+            "PLAYLIST_ENQUEUE_DELAY": 2,
+            "SUBSCRIPTION_SYNC_WORKERS": 8,
+            "SUBSCRIPTION_SYNC_DEPTH": 30,
+            "SUBSCRIPTION_FEED_SIZE": 1000,
+            "DOWNLOAD_JOBS": 2,
+            "THUMBNAIL_WORKERS": 4,
+            "THUMBNAIL_CACHE_SIZE_MB": 50,
+            "LOCAL_INDEX": True,
+            "LIVE_SEARCH": False,
+            "SEARCH_DEBOUNCE": 0.4,
+            "LIST_PAGE_SIZE": 200,
+            "TRACE_YTDLP": True,
+            "HELPER_TIMEOUT": 120,
+            "HELPER_WORKERS": 4,
+            "BATCH_WORKERS": 8,
         }
 
         self.config: Dict[str, Any] = {}
         self.load()
 
+    def _file_mtime(self) -> Optional[int]:
+        try:
+            return self.config_file.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _read(self) -> Dict[str, Any]:
+        """Read the config file and remember its mtime"""
+        self._mtime = self._file_mtime()
+        self._checked_at = time.monotonic()
+        if self._mtime is None:
+            return {}
+        try:
+            with open(self.config_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (json.JSONDecodeError, IOError):
+            return {}
+
     def load(self):
-        """Load configuration from file"""
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, "r", encoding="utf-8") as f:
-                    self.config = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                self.config = {}
-        else:
-            self.config = {}
-
-        # Merge with defaults
-        for key, value in self.defaults.items():
-            if key not in self.config:
-                self.config[key] = value
-
-        # Ensure download directory exists
-        download_dir = Path(self.config["DOWNLOAD_DIRECTORY"])
-        download_dir.mkdir(parents=True, exist_ok=True)
+        """Load configuration from file, keeping unsaved changes"""
+        with self._lock:
+            config = self._read()
+            config.update(self._dirty)
+
+            # Merge with defaults
+            for key, value in self.defaults.items():
+                if key not in config:
+                    config[key] = value
+
+            self.config = config
+
+    def _reload_if_changed(self):
+        """Reload if another process changed the file"""
+        now = time.monotonic()
+        if now - self._checked_at < self.RELOAD_INTERVAL:
+            return
+        self._checked_at = now
+        if self._file_mtime() != self._mtime:
+            self.load()
 
     def save(self):
-        """Save configuration to file"""
-        with open(self.config_file, "w", encoding="utf-8") as f:
-            json.dump(self.config, f, indent=2)
+        """Save configuration to file now"""
+        with self._lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+                self._save_timer = None
+
+            # Keep keys another process wrote since we last read the file
+            if self._file_mtime() != self._mtime:
+                self.load()
+
+            tmp_file = self.config_file.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(self.config, f, indent=2)
+                os.replace(tmp_file, self.config_file)
+            except IOError as e:
+                print(f"Error saving config: {e}")
+                return
+
+            self._dirty = {}
+            self._mtime = self._file_mtime()
+
+    def flush(self):
+        """Write pending changes, if any"""
+        with self._lock:
+            if self._dirty:
+                self.save()
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value"""
+        self._reload_if_changed()
         return self.config.get(key, default if default is not None else self.defaults.get(key))
 
     def set(self, key: str, value: Any):
-        """Set configuration value"""
-        self.config[key] = value
-        self.save()
+        """Set configuration value, saving it shortly after"""
+        with self._lock:
+            self.config[key] = value
+            self._dirty[key] = value
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    @property
+    def store(self):
+        """Library store for saved, recent, subscription and search data"""
+        if self._store is None:
+            from .store import LibraryStore
+            self._store = LibraryStore(self.library_db_file)
+            self._store.migrate_from_files(self)
+        return self._store
+
+    @property
+    def index(self):
+        """Full-text index of every video seen, or None if disabled"""
+        if self._index is None and self.get("LOCAL_INDEX", True):
+            from .index import VideoIndex
+            self._index = VideoIndex(self.index_db_file)
+            self._index.backfill_from_store(self.store)
+        return self._index
+
+    def index_entries(self, entries: list[Dict]):
+        """Add entries to the local index if it is enabled"""
+        if self.index:
+            self.index.add_many(entries)
 
     def get_search_history(self) -> list[str]:
         """Get search history"""
-        if not self.search_history_file.exists():
-            return []
-        try:
-            with open(self.search_history_file, "r", encoding="utf-8") as f:
-                return [line.strip() for line in f.readlines() if line.strip()]
-        except IOError:
-            return []
+        return self.store.get_searches(limit=50)
 
     def add_search_history(self, query: str):
         """Add query to search history"""
         if not self.get("SEARCH_HISTORY", True):
             return
 
-        history = self.get_search_history()
-        if query in history:
-            history.remove(query)
-        history.insert(0, query)
-
         # Keep only last 50 entries
-        history = history[:50]
-
-        with open(self.search_history_file, "w", encoding="utf-8") as f:
-            f.write("\n".join(history))
+        self.store.add_search(query, limit=50)
 
     def clear_search_history(self):
         """Clear search history"""
+        self.store.clear_searches()
         if self.search_history_file.exists():
             self.search_history_file.unlink()
 
-    def get_saved_videos(self) -> list[Dict]:
-        """Get saved videos"""
-        if not self.saved_videos_file.exists():
-            return []
-        try:
-            with open(self.saved_videos_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data.get("entries", [])
-        except (json.JSONDecodeError, IOError):
-            return []
+    def get_saved_videos(self, limit: Optional[int] = None, offset: int = 0) -> list[VideoEntry]:
+        """Get saved videos, newest first"""
+        return [VideoEntry.from_dict(data) for data in self.store.list("saved", limit=limit, offset=offset)]
 
-    def add_saved_video(self, video: Dict):
+    def add_saved_video(self, video: Union[VideoEntry, Dict]):
         """Add video to saved videos"""
-        saved = self.get_saved_videos()
-        video_id = video.get("id")
-
-        # Remove if already exists
-        saved = [v for v in saved if v.get("id") != video_id]
-
-        # Add to beginning
-        saved.insert(0, video)
+        video = VideoEntry.from_dict(video)
+        video_id = video.id or video.url
 
         # Keep only configured number
         no_of_recent = self.get("NO_OF_RECENT", 30)
-        saved = saved[:no_of_recent]
-
-        with open(self.saved_videos_file, "w", encoding="utf-8") as f:
-            json.dump({"entries": saved}, f, indent=2)
+        data = video.to_dict()
+        self.store.upsert("saved", video_id, data, limit=no_of_recent)
+        self.index_entries([data])
 
     def remove_saved_video(self, video_id: str):
         """Remove video from saved videos"""
-        saved = self.get_saved_videos()
-        saved = [v for v in saved if v.get("id") != video_id]
+        self.store.remove("saved", video_id)
 
-        with open(self.saved_videos_file, "w", encoding="utf-8") as f:
-            json.dump({"entries": saved}, f, indent=2)
-
-    def get_recent_videos(self) -> list[Dict]:
-        """Get recent videos"""
-        if not self.recent_videos_file.exists():
-            return []
-        try:
-            with open(self.recent_videos_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data.get("entries", [])
-        except (json.JSONDecodeError, IOError):
-            return []
+    def get_recent_videos(self, limit: Optional[int] = None, offset: int = 0) -> list[VideoEntry]:
+        """Get recent videos, newest first"""
+        return [VideoEntry.from_dict(data) for data in self.store.list("recent", limit=limit, offset=offset)]
 
-    def add_recent_video(self, video: Dict):
+    def add_recent_video(self, video: Union[VideoEntry, Dict]):
         """Add video to recent"""
         if not self.get("UPDATE_RECENT", True):
             return
 
-        recent = self.get_recent_videos()
-        video_id = video.get("id")
-
-        # Remove if already exists
-        recent = [v for v in recent if v.get("id") != video_id]
-
-        # Add to beginning
-        recent.insert(0, video)
+        video = VideoEntry.from_dict(video)
+        video_id = video.id or video.url
 
         # Keep only configured number
         no_of_recent = self.get("NO_OF_RECENT", 30)
-        recent = recent[:no_of_recent]
-
-        with open(self.recent_videos_file, "w", encoding="utf-8") as f:
-            json.dump({"entries": recent}, f, indent=2)
+        data = video.to_dict()
+        self.store.upsert("recent", video_id, data, limit=no_of_recent)
+        self.index_entries([data])
 
     def get_custom_playlists(self) -> list[Dict]:
         """Get custom playlists"""
@@ -217,30 +299,28 @@ class Config:
 
     def get_subscriptions(self) -> list[Dict]:
         """Get subscriptions"""
-        if not self.subscriptions_file.exists():
-            return []
-        try:
-            with open(self.subscriptions_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data.get("entries", [])
-        except (json.JSONDecodeError, IOError):
-            return []
+        return self.store.list("subscriptions")
 
     def save_subscriptions(self, entries: list[Dict]):
         """Save subscriptions"""
-        with open(self.subscriptions_file, "w", encoding="utf-8") as f:
-            json.dump({"entries": entries}, f, indent=2)
+        self.store.replace("subscriptions", entries)
+        self.index_entries(entries)
 
     def add_subscription(self, channel: Dict):
         """Add channel to subscriptions"""
-        subs = self.get_subscriptions()
-        channel_id = channel.get("id")
+        channel_id = channel.get("id") or channel.get("url")
+        self.store.upsert("subscriptions", channel_id, channel)
+        self.index_entries([channel])
+
 
-        # Remove if already exists
-        subs = [c for c in subs if c.get("id") != channel_id]
+_instance: Optional[Config] = None
+_instance_lock = threading.Lock()
 
-        # Add to beginning
-        subs.insert(0, channel)
 
-        with open(self.subscriptions_file, "w", encoding="utf-8") as f:
-            json.dump({"entries": subs}, f, indent=2)
+def get_config() -> Config:
+    """Get the shared configuration for this process"""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = Config()
+        return _instance
@@ -0,0 +1,283 @@
+"""
+Persistent download queue with parallel jobs and progress tracking
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, List, Optional
+
+
+# Marks yt-dlp progress lines produced by --progress-template
+PROGRESS_PREFIX = "[yt-x-progress] "
+
+QUEUED = "queued"
+RUNNING = "running"
+PAUSED = "paused"
+DONE = "done"
+FAILED = "failed"
+
+
+class DownloadQueue:
+    """Runs downloads in the background and remembers them across restarts
+
+    Jobs are stored in Config.data_dir/downloads.json. Up to DOWNLOAD_JOBS
+    run at the same time; progress is parsed from yt-dlp's JSON progress
+    template. Pausing stops the yt-dlp process and keeps its partial file,
+    so resuming continues where it left off.
+    """
+
+    def __init__(self, config, ytdlp):
+        self.config = config
+        self.ytdlp = ytdlp
+        self.jobs_file = config.data_dir / "downloads.json"
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._processes: Dict[str, subprocess.Popen] = {}
+        self._started = False
+        self._jobs: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load jobs; jobs interrupted by a crash are queued again"""
+        try:
+            with open(self.jobs_file, "r", encoding="utf-8") as f:
+                jobs = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return {}
+
+        result = {}
+        for job in jobs:
+            if job.get("status") == RUNNING:
+                job["status"] = QUEUED
+            result[job["id"]] = job
+        return result
+
+    def _save(self):
+        """Persist jobs atomically"""
+        with self._lock:
+            jobs = [dict(job) for job in self._jobs.values()]
+
+        tmp_file = self.jobs_file.with_suffix(f".{os.getpid()}.tmp")
+        with self._save_lock:
+            try:
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(jobs, f, indent=2)
+                os.replace(tmp_file, self.jobs_file)
+            except IOError as e:
+                print(f"Error saving download queue: {e}")
+
+    def start(self):
+        """Start running queued jobs"""
+        self._started = True
+        self._schedule()
+
+    def add(
+        self,
+        url: str,
+        output_template: str,
+        audio_only: bool = False,
+        title: Optional[str] = None,
+        extra_args: Optional[List[str]] = None
+    ) -> str:
+        """
+        Add a download to the queue
+
+        Returns:
+            Job ID
+        """
+        os.makedirs(self.config.get("DOWNLOAD_DIRECTORY"), exist_ok=True)
+
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "url": url,
+            "title": title or url,
+            "output_template": output_template,
+            "audio_only": audio_only,
+            "extra_args": extra_args or [],
+            "status": QUEUED,
+            "progress": 0.0,
+            "speed": None,
+            "eta": None,
+            "error": None,
+            "attempts": 0,
+            "created_at": time.time(),
+        }
+
+        with self._lock:
+            self._jobs[job["id"]] = job
+        self._save()
+        self._schedule()
+        return job["id"]
+
+    def jobs(self) -> List[Dict]:
+        """Get a snapshot of all jobs, oldest first"""
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()]
+
+    def pause(self, job_id: str):
+        """Pause a queued or running job"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job["status"] not in (QUEUED, RUNNING):
+                return
+            job["status"] = PAUSED
+            process = self._processes.get(job_id)
+
+        if process:
+            process.terminate()
+        self._save()
+
+    def resume(self, job_id: str):
+        """Resume a paused job"""
+        self._requeue(job_id, (PAUSED,))
+
+    def retry(self, job_id: str):
+        """Retry a failed job"""
+        self._requeue(job_id, (FAILED,))
+
+    def _requeue(self, job_id: str, from_states: tuple):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job["status"] not in from_states:
+                return
+            job["status"] = QUEUED
+            job["error"] = None
+        self._save()
+        self._schedule()
+
+    def remove(self, job_id: str):
+        """Remove a job, stopping it if it is running"""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            process = self._processes.get(job_id)
+
+        if job and process:
+            process.terminate()
+        self._save()
+
+    def shutdown(self):
+        """Stop running downloads; they are resumed on next start"""
+        with self._lock:
+            self._started = False
+            processes = list(self._processes.values())
+            for job in self._jobs.values():
+                if job["status"] == RUNNING:
+                    job["status"] = QUEUED
+
+        for process in processes:
+            process.terminate()
+        self._save()
+
+    def _schedule(self):
+        """Start queued jobs up to the parallel job limit"""
+        if not self._started:
+            return
+
+        max_jobs = int(self.config.get("DOWNLOAD_JOBS", 2))
+
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if job["status"] == RUNNING)
+            for job in self._jobs.values():
+                if running >= max_jobs:
+                    break
+                if job["status"] == QUEUED:
+                    job["status"] = RUNNING
+                    job["attempts"] += 1
+                    running += 1
+                    threading.Thread(target=self._run, args=(job["id"],), daemon=True).start()
+
+    def _run(self, job_id: str):
+        """Run one job and record its outcome"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            job = dict(job) if job and job["status"] == RUNNING else None
+        if not job:
+            # Paused or removed before the thread got going
+            self._schedule()
+            return
+
+        cmd = self.ytdlp.download_command(
+            job["url"], job["output_template"], job["audio_only"], job["extra_args"]
+        )
+        if self.ytdlp.has_capability("progress-template"):
+            cmd.extend(["--newline", "--progress-template", f"download:{PROGRESS_PREFIX}%(progress)j"])
+
+        self._save()
+
+        errors = deque(maxlen=5)
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding="utf-8",
+                errors="replace"
+            )
+        except OSError as e:
+            self._finish(job_id, FAILED, str(e))
+            return
+
+        with self._lock:
+            self._processes[job_id] = process
+            job = self._jobs.get(job_id)
+            stopped = not job or job["status"] != RUNNING
+
+        # pause, remove or shutdown ran before the process was registered
+        if stopped:
+            process.terminate()
+
+        for line in process.stdout:
+            if line.startswith(PROGRESS_PREFIX):
+                self._update_progress(job_id, line[len(PROGRESS_PREFIX):])
+            elif line.startswith("ERROR"):
+                errors.append(line.strip())
+
+        returncode = process.wait()
+
+        with self._lock:
+            self._processes.pop(job_id, None)
+
+        if returncode == 0:
+            self._finish(job_id, DONE)
+        else:
+            self._finish(job_id, FAILED, "\n".join(errors) or f"yt-dlp exited with code {returncode}")
+
+    def _update_progress(self, job_id: str, payload: str):
+        """Apply a yt-dlp progress record to a job"""
+        try:
+            progress = json.loads(payload)
+        except json.JSONDecodeError:
+            return
+
+        downloaded = progress.get("downloaded_bytes") or 0
+        total = progress.get("total_bytes") or progress.get("total_bytes_estimate")
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return
+            if total:
+                job["progress"] = min(100.0, downloaded * 100.0 / total)
+            job["speed"] = progress.get("speed")
+            job["eta"] = progress.get("eta")
+
+    def _finish(self, job_id: str, status: str, error: Optional[str] = None):
+        """Record a job's final state and start the next ones"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            # Paused or removed jobs keep their state
+            if job and job["status"] == RUNNING:
+                job["status"] = status
+                job["error"] = error
+                if status == DONE:
+                    job["progress"] = 100.0
+                    job["speed"] = None
+                    job["eta"] = None
+
+        self._save()
+        self._schedule()
@@ -0,0 +1,216 @@
+"""
+In-process yt-dlp engine using the yt_dlp Python API
+"""
+
+import importlib.util
+import itertools
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Options that only control what the yt-dlp CLI prints to stdout.
+# The engine returns data directly, so they are dropped.
+_PRINT_OPTIONS = (
+    "dump_single_json",
+    "forcejson",
+    "forceurl",
+    "forcetitle",
+    "forceid",
+    "forcethumbnail",
+    "forcedescription",
+    "forcefilename",
+    "forceduration",
+    "forceprint",
+    "print_to_file",
+)
+
+
+class _ErrorLog:
+    """yt-dlp logger that keeps error messages instead of printing them"""
+
+    def __init__(self):
+        self.messages: List[str] = []
+
+    def debug(self, msg: str):
+        pass
+
+    def info(self, msg: str):
+        pass
+
+    def warning(self, msg: str):
+        pass
+
+    def error(self, msg: str):
+        self.messages.append(msg)
+
+
+def _extract_info(ydl, url: str, **kwargs) -> Dict:
+    """Run ``extract_info``, raising RuntimeError with yt-dlp's message on failure"""
+    log = ydl.params["logger"]
+    log.messages.clear()
+    try:
+        info = ydl.extract_info(url, download=False, **kwargs)
+    except Exception as e:
+        raise RuntimeError(str(e) or type(e).__name__) from e
+    if not info:
+        raise RuntimeError(log.messages[-1] if log.messages else f"No result for {url}")
+    return info
+
+
+class InProcessEngine:
+    """Runs yt-dlp extractions inside the current process
+
+    One warm ``YoutubeDL`` instance is kept per distinct option set, so the
+    extractor imports, player JS cache and cookies are reused across calls.
+    """
+
+    MAX_INSTANCES = 8
+
+    def __init__(self):
+        import yt_dlp
+
+        self._yt_dlp = yt_dlp
+        self._instances: "OrderedDict[Tuple[str, ...], Tuple[object, threading.Lock]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check if the yt_dlp Python package is installed"""
+        return importlib.util.find_spec("yt_dlp") is not None
+
+    def _get_instance(self, args: List[str]) -> Tuple[object, threading.Lock]:
+        """Get a warm YoutubeDL instance for the given CLI arguments"""
+        key = tuple(args)
+
+        with self._lock:
+            if key in self._instances:
+                self._instances.move_to_end(key)
+                return self._instances[key]
+
+        instance = (self._create_instance(args), threading.Lock())
+
+        with self._lock:
+            self._instances[key] = instance
+            while len(self._instances) > self.MAX_INSTANCES:
+                _, (old, _) = self._instances.popitem(last=False)
+                old.close()
+            return instance
+
+    def _create_instance(self, args: List[str]):
+        """Create a YoutubeDL instance for the given CLI arguments"""
+        # Translate CLI arguments with yt-dlp's own parser so both
+        # backends interpret options identically
+        opts = dict(self._yt_dlp.parse_options(list(args)).ydl_opts)
+        for option in _PRINT_OPTIONS:
+            opts.pop(option, None)
+        # The CLI defaults to ignoreerrors='only_download', which turns
+        # extraction failures into a None result; raise them instead
+        opts.update({
+            "quiet": True,
+            "no_warnings": True,
+            "noprogress": True,
+            "ignoreerrors": False,
+            "logger": _ErrorLog(),
+        })
+        return self._yt_dlp.YoutubeDL(opts)
+
+    @contextmanager
+    def _instance(self, args: List[str]) -> Iterator[object]:
+        """Use the warm instance for these arguments, or a temporary one while it is busy"""
+        ydl, lock = self._get_instance(args)
+        if lock.acquire(blocking=False):
+            try:
+                yield ydl
+            finally:
+                lock.release()
+            return
+
+        # Concurrent calls with the same options run side by side
+        ydl = self._create_instance(args)
+        try:
+            yield ydl
+        finally:
+            ydl.close()
+
+    def extract(self, url: str, args: List[str], cancel: Optional[threading.Event] = None) -> Optional[Dict]:
+        """
+        Extract info like ``yt-dlp -J``
+
+        Args:
+            url: URL to extract
+            args: yt-dlp CLI arguments (without the URL)
+            cancel: Unused; an in-process extraction cannot be interrupted
+
+        Returns:
+            Sanitized info dictionary, same shape as the -J output
+
+        Raises:
+            RuntimeError: If yt-dlp cannot extract the URL
+        """
+        with self._instance(args) as ydl:
+            info = _extract_info(ydl, url)
+            return ydl.sanitize_info(info)
+
+    def iter_entries(self, url: str, args: List[str]) -> Iterator[Dict]:
+        """
+        Yield playlist entries lazily like ``yt-dlp -j --flat-playlist``
+
+        Args:
+            url: Playlist URL
+            args: yt-dlp CLI arguments (without the URL)
+
+        Yields:
+            Sanitized entry dictionaries in playlist order
+        """
+        # The consumer may pause between entries for as long as it likes,
+        # so streams get their own instance instead of locking a shared one
+        ydl = self._create_instance(args)
+        start = ydl.params.get("playliststart") or 1
+        end = ydl.params.get("playlistend")
+
+        try:
+            info = _extract_info(ydl, url, process=False)
+            # Follow redirects such as the front page to its feed tab
+            while info.get("_type") == "url":
+                info = _extract_info(ydl, info["url"], process=False)
+
+            if info.get("_type") not in ("playlist", "multi_video"):
+                yield ydl.sanitize_info(ydl.process_ie_result(info, download=False))
+                return
+
+            entries = itertools.islice(info.get("entries") or [], start - 1, end)
+            for entry in entries:
+                if entry:
+                    yield ydl.sanitize_info(entry)
+        finally:
+            ydl.close()
+
+    def resolve_url(self, url: str, args: List[str], timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Resolve a direct stream URL like ``yt-dlp --get-url``
+
+        Args:
+            url: Video URL
+            args: yt-dlp CLI arguments (without the URL)
+            timeout: Unused; an in-process extraction cannot be interrupted
+
+        Returns:
+            Direct URL of the last requested format
+
+        Raises:
+            RuntimeError: If yt-dlp cannot extract the URL
+        """
+        with self._instance(args) as ydl:
+            info = _extract_info(ydl, url)
+
+        formats = info.get("requested_formats") or [info]
+        return formats[-1].get("url")
+
+    def close(self):
+        """Close all cached YoutubeDL instances"""
+        with self._lock:
+            for ydl, _ in self._instances.values():
+                ydl.close()
+            self._instances.clear()
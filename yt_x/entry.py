@@ -0,0 +1,128 @@
+"""
+Compact video records shared by the UI, library and player
+"""
+
+import time
+from typing import Dict, Optional
+
+from .index import MAX_DESCRIPTION
+
+
+def format_duration(duration: int) -> str:
+    """Format duration in human readable format"""
+    hours = duration // 3600
+    minutes = (duration % 3600) // 60
+    seconds = duration % 60
+
+    if hours > 0:
+        return f"{hours}h {minutes}m"
+    elif minutes > 0:
+        return f"{minutes}m {seconds}s"
+    else:
+        return f"{seconds}s"
+
+
+def format_views(views: int) -> str:
+    """Format view count"""
+    if views >= 1000000:
+        return f"{views / 1000000:.1f}M"
+    elif views >= 1000:
+        return f"{views / 1000:.1f}K"
+    else:
+        return str(views)
+
+
+class VideoEntry:
+    """One video of a list, keeping only what yt-x shows or plays
+
+    Built from yt-dlp entries and library records with from_dict, and
+    turned back into a dict with to_dict for storage. Display strings
+    are formatted on first use and kept.
+    """
+
+    __slots__ = ("id", "url", "title", "channel", "duration", "view_count",
+                 "upload_date", "thumbnail", "description", "_duration_text", "_views_text")
+
+    def __init__(
+        self,
+        id: Optional[str] = None,
+        url: Optional[str] = None,
+        title: Optional[str] = None,
+        channel: Optional[str] = None,
+        duration: Optional[int] = None,
+        view_count: Optional[int] = None,
+        upload_date: Optional[str] = None,
+        thumbnail: Optional[str] = None,
+        description: Optional[str] = None
+    ):
+        self.id = id
+        self.url = url
+        self.title = title
+        self.channel = channel
+        self.duration = duration
+        self.view_count = view_count
+        self.upload_date = upload_date
+        self.thumbnail = thumbnail
+        self.description = description
+        self._duration_text = None
+        self._views_text = None
+
+    @classmethod
+    def from_dict(cls, data) -> "VideoEntry":
+        """
+        Build a record from a yt-dlp entry or a stored one
+
+        Args:
+            data: Entry dictionary; a VideoEntry is returned as is
+
+        Returns:
+            VideoEntry with the fields yt-x uses
+        """
+        if isinstance(data, VideoEntry):
+            return data
+
+        from .thumbnails import thumbnail_url
+
+        upload_date = data.get("upload_date")
+        timestamp = data.get("timestamp") or data.get("release_timestamp")
+        if not upload_date and timestamp:
+            upload_date = time.strftime("%Y%m%d", time.gmtime(timestamp))
+
+        duration = data.get("duration")
+        view_count = data.get("view_count")
+        # Only as much as the local index searches
+        description = (data.get("description") or "").strip()[:MAX_DESCRIPTION]
+        return cls(
+            id=data.get("id"),
+            url=data.get("url") or data.get("webpage_url"),
+            title=data.get("title"),
+            channel=data.get("channel") or data.get("uploader"),
+            duration=int(duration) if duration is not None else None,
+            view_count=int(view_count) if view_count is not None else None,
+            upload_date=upload_date,
+            thumbnail=thumbnail_url(data),
+            description=description or None,
+        )
+
+    def to_dict(self) -> Dict:
+        """Get the set fields as a dictionary, for storage and indexing"""
+        return {
+            name: getattr(self, name)
+            for name in self.__slots__
+            if not name.startswith("_") and getattr(self, name) is not None
+        }
+
+    @property
+    def duration_text(self) -> str:
+        if self._duration_text is None:
+            self._duration_text = format_duration(self.duration or 0)
+        return self._duration_text
+
+    @property
+    def views_text(self) -> str:
+        if self._views_text is None:
+            self._views_text = format_views(self.view_count or 0)
+        return self._views_text
+
+    def __repr__(self) -> str:
+        return f"VideoEntry(id={self.id!r}, title={self.title!r})"
@@ -0,0 +1,187 @@
+"""
+Executable discovery for yt-dlp and video players
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# yt-dlp options used by yt-x and the first release that supports them
+YT_DLP_CAPABILITIES = {
+    "flat-playlist-lines": "2021.01.08",
+    "progress-template": "2021.10.09",
+    "print": "2021.10.09",
+}
+
+
+def _yt_dlp_capabilities(version: str) -> List[str]:
+    """Get capabilities supported by a yt-dlp version"""
+    # Versions are dates like 2024.08.06 and compare correctly as strings
+    release = version.split()[0] if version else ""
+    return [name for name, since in YT_DLP_CAPABILITIES.items() if release >= since]
+
+
+class ExecutableCache:
+    """Resolves executables on PATH and remembers them on disk
+
+    Lookups stay valid while PATH and the binary's mtime are unchanged.
+    Versions are probed once per binary and stored alongside.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_file = Path(cache_dir) / "executables.json"
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> Dict:
+        """Load cached lookups, discarding them if PATH changed"""
+        path_env = os.environ.get("PATH", "")
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("path_env") == path_env:
+                return data
+        except (json.JSONDecodeError, IOError):
+            pass
+        return {"path_env": path_env, "lookups": {}, "binaries": {}}
+
+    def _save(self):
+        """Write cached lookups to disk"""
+        tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, indent=2)
+            os.replace(tmp_file, self.cache_file)
+        except IOError:
+            pass
+
+    @staticmethod
+    def _mtime(path: str) -> Optional[float]:
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def find(self, names: List[str], refresh: bool = False) -> Optional[str]:
+        """
+        Find the first of the given executables on PATH
+
+        Args:
+            names: Executable names to try in order
+            refresh: Ignore the cached lookup
+
+        Returns:
+            Absolute path to the executable, or None if not found
+        """
+        key = "|".join(names)
+
+        with self._lock:
+            path = self._data["lookups"].get(key)
+            if path and path in self._data["binaries"] and not refresh:
+                if self._data["binaries"][path].get("mtime") == self._mtime(path):
+                    return path
+
+        for name in names:
+            path = shutil.which(name)
+            if path:
+                break
+        else:
+            return None
+
+        with self._lock:
+            self._data["lookups"][key] = path
+            binary = self._data["binaries"].get(path, {})
+            mtime = self._mtime(path)
+            if binary.get("mtime") != mtime:
+                binary = {"mtime": mtime}
+            self._data["binaries"][path] = binary
+            self._save()
+
+        return path
+
+    def get_info(self, path: str, timeout: int = 10, refresh: bool = False) -> Dict:
+        """
+        Get version and capabilities of an executable
+
+        Runs ``--version`` only the first time a binary is seen.
+
+        Args:
+            path: Absolute path returned by find()
+            timeout: Seconds to wait for the version probe
+            refresh: Probe again even if a result is cached
+
+        Returns:
+            Dictionary with "version" and "capabilities" keys
+        """
+        mtime = self._mtime(path)
+
+        with self._lock:
+            binary = self._data["binaries"].get(path, {})
+            if binary.get("mtime") == mtime and "version" in binary and not refresh:
+                return binary
+
+        version = None
+        try:
+            result = subprocess.run(
+                [path, "--version"],
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+            if result.returncode == 0 and result.stdout.strip():
+                version = result.stdout.strip().splitlines()[0]
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+        capabilities = []
+        if version and Path(path).stem.lower() == "yt-dlp":
+            capabilities = _yt_dlp_capabilities(version)
+
+        binary = {"mtime": mtime, "version": version, "capabilities": capabilities}
+
+        with self._lock:
+            self._data["binaries"][path] = binary
+            self._save()
+
+        return binary
+
+    def probe_all(self, names: List[str], timeout: int = 5, refresh: bool = False) -> Dict[str, Optional[Dict]]:
+        """
+        Find and probe several executables concurrently
+
+        Args:
+            names: Executable names, e.g. ["yt-dlp", "mpv"]
+            timeout: Seconds to wait for each version probe
+            refresh: Ignore cached lookups and versions
+
+        Returns:
+            Mapping of name to {"path", "version", "capabilities"}, or None if not found
+        """
+        def probe(name: str) -> Optional[Dict]:
+            path = self.find([name, f"{name}.exe"], refresh=refresh)
+            if not path:
+                return None
+            info = self.get_info(path, timeout=timeout, refresh=refresh)
+            return {"path": path, "version": info.get("version"), "capabilities": info.get("capabilities", [])}
+
+        with ThreadPoolExecutor(max_workers=max(len(names), 1)) as executor:
+            return dict(zip(names, executor.map(probe, names)))
+
+
+_instances: Dict[Path, ExecutableCache] = {}
+_instances_lock = threading.Lock()
+
+
+def get_executable_cache(cache_dir: Path) -> ExecutableCache:
+    """Get the process-wide executable cache for a cache directory"""
+    cache_dir = Path(cache_dir)
+    with _instances_lock:
+        if cache_dir not in _instances:
+            _instances[cache_dir] = ExecutableCache(cache_dir)
+        return _instances[cache_dir]
@@ -0,0 +1,489 @@
+"""
+Long-lived yt-dlp helper process
+
+The helper keeps the yt_dlp Python API loaded in a separate process, so
+extractions skip interpreter and extractor startup while a crashing or
+hanging extractor cannot take the UI down with it.
+
+Requests and responses are JSON objects, one per line, tagged with the
+request id so several can be in flight at once:
+
+    -> {"id": 1, "op": "extract", "url": "...", "args": [...]}
+    <- {"id": 1, "result": {...}}
+
+    -> {"id": 2, "op": "entries", "url": "...", "args": [...]}
+    <- {"id": 2, "entry": {...}}        (one per entry)
+    <- {"id": 2, "done": true}
+    -> {"id": 2, "op": "more", "count": 50}
+    -> {"id": 2, "op": "cancel"}
+    <- {"id": 2, "cancelled": true}     (once the request has stopped)
+
+"entries" sends at most STREAM_WINDOW entries ahead of what the client
+asked for with "more", so a paused list does not fill memory. Failures
+are answered with {"id": n, "error": "..."}.
+"""
+
+import argparse
+import atexit
+import itertools
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# Entries streamed ahead of the client before waiting for "more"
+STREAM_WINDOW = 100
+
+
+class _Request:
+    """A request in flight, as seen by the client"""
+
+    def __init__(self, request_id: int, process: subprocess.Popen, timeout: Optional[float], stream: bool = False):
+        self.id = request_id
+        self.process = process
+        self.timeout = timeout
+        self.stream = stream
+        self.responses: "queue.Queue[Dict]" = queue.Queue()
+        self.deadline = time.monotonic() + timeout if timeout else None
+        # Entries the helper may still send before it waits for "more"
+        self.credit = STREAM_WINDOW if stream else 0
+        self.finished = False
+        # Cancelled by the client but still running in the helper
+        self.abandoned = False
+
+    def is_stuck(self, now: float) -> bool:
+        """Check if the helper has been working on this for too long"""
+        if self.deadline is None or now < self.deadline:
+            return False
+        if self.abandoned:
+            return True
+        if self.finished:
+            return False
+        # A stream waiting for the client to read on is idle, not stuck
+        return not self.stream or self.credit > 0
+
+
+class HelperEngine:
+    """Runs yt-dlp extractions in a warm helper process
+
+    Offers the same calls as InProcessEngine. The helper is started on
+    first use and again whenever it has died. A watchdog kills it when
+    a request makes no progress for `timeout` seconds; requests in
+    flight then fail and the next one starts a fresh helper.
+
+    Cancelled requests stay tracked until the helper reports them
+    stopped, as yt-dlp cannot interrupt an extraction. Once they occupy
+    every worker, new requests go to a fresh helper and the old one is
+    killed when only cancelled work is left on it.
+    """
+
+    START_TIMEOUT = 30
+    WATCHDOG_INTERVAL = 1.0
+    CANCEL_POLL = 0.1
+
+    def __init__(self, timeout: float = 120, workers: int = 4):
+        self.timeout = timeout
+        self.workers = workers
+        self._process: Optional[subprocess.Popen] = None
+        self._requests: Dict[int, _Request] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        atexit.register(self.close)
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check if a helper can be started from this installation"""
+        from .engine import InProcessEngine
+
+        # A frozen executable cannot run `python -m yt_x.helper`
+        return InProcessEngine.is_available() and not getattr(sys, "frozen", False)
+
+    def _start(self) -> subprocess.Popen:
+        """Start a helper and wait until it has loaded yt-dlp"""
+        env = dict(os.environ)
+        package_root = str(Path(__file__).resolve().parent.parent)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+
+        process = subprocess.Popen(
+            [sys.executable, "-m", "yt_x.helper", "--workers", str(self.workers)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env
+        )
+
+        # The helper answers request 0 once it is ready
+        ready = _Request(0, process, self.START_TIMEOUT)
+        with self._lock:
+            self._requests[0] = ready
+        threading.Thread(target=self._read, args=(process,), daemon=True).start()
+        threading.Thread(target=self._watch, args=(process,), daemon=True).start()
+
+        try:
+            response = ready.responses.get(timeout=self.START_TIMEOUT)
+        except queue.Empty:
+            response = {"error": "timed out"}
+        finally:
+            with self._lock:
+                self._requests.pop(0, None)
+
+        if "error" in response:
+            process.kill()
+            raise RuntimeError(f"yt-dlp helper did not start: {response['error']}")
+        return process
+
+    def _read(self, process: subprocess.Popen):
+        """Route the helper's responses to their requests"""
+        for line in process.stdout:
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue
+            with self._lock:
+                request = self._requests.get(response.get("id"))
+                if request is None:
+                    continue
+                if request.abandoned:
+                    # Nobody waits for it; forget it once the helper is done
+                    if "entry" not in response:
+                        self._requests.pop(request.id, None)
+                    continue
+                if "entry" in response:
+                    request.credit -= 1
+                if request.timeout:
+                    request.deadline = time.monotonic() + request.timeout
+            request.responses.put(response)
+
+        process.wait()
+        with self._lock:
+            if self._process is process:
+                self._process = None
+            orphaned = [r for r in self._requests.values() if r.process is process]
+            for request in orphaned:
+                if request.abandoned:
+                    self._requests.pop(request.id, None)
+        for request in orphaned:
+            request.responses.put({"error": "yt-dlp helper stopped"})
+
+    def _watch(self, process: subprocess.Popen):
+        """Kill the helper if a request is stuck, or once it has been drained"""
+        draining = False
+        while process.poll() is None:
+            time.sleep(self.WATCHDOG_INTERVAL)
+            now = time.monotonic()
+            with self._lock:
+                pending = [r for r in self._requests.values() if r.process is process]
+                stuck = [r for r in pending if r.is_stuck(now)]
+                abandoned = sum(1 for r in pending if r.abandoned)
+                # Every worker may be busy with cancelled requests: start
+                # new ones on a fresh helper and let this one drain
+                if abandoned >= self.workers and self._process is process:
+                    self._process = None
+                    draining = True
+                drained = draining and abandoned == len(pending)
+            if drained:
+                process.kill()
+                return
+            if stuck:
+                # Stop handing out the dying helper before it is killed
+                with self._lock:
+                    if self._process is process:
+                        self._process = None
+                for request in stuck:
+                    request.responses.put({"error": f"timed out after {request.timeout:g}s"})
+                process.kill()
+                return
+
+    def _send(self, process: subprocess.Popen, message: Dict):
+        line = (json.dumps(message) + "\n").encode("utf-8")
+        with self._write_lock:
+            try:
+                process.stdin.write(line)
+                process.stdin.flush()
+            except (OSError, ValueError):
+                raise RuntimeError("yt-dlp helper stopped")
+
+    def _submit(self, op: str, url: str, args: List[str], timeout: Optional[float], stream: bool = False) -> _Request:
+        """Send a request, starting the helper if it is not running"""
+        with self._start_lock:
+            with self._lock:
+                process = self._process
+            if process is None or process.poll() is not None:
+                process = self._start()
+                with self._lock:
+                    self._process = process
+
+        with self._lock:
+            request = _Request(next(self._ids), process, timeout or self.timeout, stream)
+            self._requests[request.id] = request
+
+        try:
+            # Registered after the helper died: nothing would ever answer it
+            if process.poll() is not None:
+                raise RuntimeError("yt-dlp helper stopped")
+            self._send(process, {"id": request.id, "op": op, "url": url, "args": list(args)})
+        except RuntimeError:
+            self._finish(request, cancel=False)
+            raise
+        return request
+
+    def _finish(self, request: _Request, cancel: bool):
+        """Forget a request, telling the helper to stop if it is still running"""
+        cancel = cancel and request.process.poll() is None
+        with self._lock:
+            request.finished = True
+            if cancel:
+                # Kept until the helper has stopped it, so the watchdog sees it
+                request.abandoned = True
+            else:
+                self._requests.pop(request.id, None)
+        if cancel:
+            try:
+                self._send(request.process, {"id": request.id, "op": "cancel"})
+            except RuntimeError:
+                # The helper is gone and will never answer
+                with self._lock:
+                    self._requests.pop(request.id, None)
+
+    def _call(
+        self,
+        op: str,
+        url: str,
+        args: List[str],
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> Any:
+        """Send a request and wait for its result, or None once cancelled"""
+        request = self._submit(op, url, args, timeout)
+        done = False
+        try:
+            while True:
+                try:
+                    response = request.responses.get(timeout=self.CANCEL_POLL)
+                except queue.Empty:
+                    if cancel and cancel.is_set():
+                        return None
+                    continue
+                done = True
+                if "error" in response:
+                    raise RuntimeError(response["error"])
+                return response.get("result")
+        finally:
+            self._finish(request, cancel=not done)
+
+    def extract(self, url: str, args: List[str], cancel: Optional[threading.Event] = None) -> Optional[Dict]:
+        """
+        Extract info like ``yt-dlp -J``
+
+        Args:
+            url: URL to extract
+            args: yt-dlp CLI arguments (without the URL)
+            cancel: Stops waiting and cancels the request when set
+
+        Returns:
+            Info dictionary, or None if cancelled
+
+        Raises:
+            RuntimeError: With yt-dlp's message if the extraction fails
+        """
+        return self._call("extract", url, args, cancel=cancel)
+
+    def iter_entries(self, url: str, args: List[str]) -> Iterator[Dict]:
+        """
+        Yield playlist entries lazily like ``yt-dlp -j --flat-playlist``
+
+        Closing the generator early cancels the request.
+        """
+        request = self._submit("entries", url, args, None, stream=True)
+        done = False
+        received = 0
+        try:
+            while True:
+                response = request.responses.get()
+                if "error" in response:
+                    done = True
+                    raise RuntimeError(response["error"])
+                if response.get("done"):
+                    done = True
+                    return
+
+                yield response["entry"]
+
+                # Top the window back up once half of it has been read
+                received += 1
+                if received % (STREAM_WINDOW // 2) == 0:
+                    with self._lock:
+                        request.credit += STREAM_WINDOW // 2
+                        request.deadline = time.monotonic() + request.timeout
+                    self._send(request.process, {"id": request.id, "op": "more", "count": STREAM_WINDOW // 2})
+        finally:
+            self._finish(request, cancel=not done)
+
+    def resolve_url(self, url: str, args: List[str], timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Resolve a direct stream URL like ``yt-dlp --get-url``
+
+        Args:
+            url: Video URL
+            args: yt-dlp CLI arguments (without the URL)
+            timeout: Seconds before the helper is considered stuck
+
+        Raises:
+            RuntimeError: With yt-dlp's message if the extraction fails
+        """
+        return self._call("resolve", url, args, timeout=timeout)
+
+    def close(self):
+        """Stop the helper"""
+        with self._lock:
+            process, self._process = self._process, None
+        if process and process.poll() is None:
+            try:
+                process.stdin.close()
+                process.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+
+
+class _ServerRequest:
+    """A request being handled inside the helper"""
+
+    def __init__(self):
+        self.cancelled = False
+        self.credit = STREAM_WINDOW
+        self.condition = threading.Condition()
+
+    def cancel(self):
+        with self.condition:
+            self.cancelled = True
+            self.condition.notify_all()
+
+    def grant(self, count: int):
+        with self.condition:
+            self.credit += count
+            self.condition.notify_all()
+
+    def take(self) -> bool:
+        """Wait until one more entry may be sent; False once cancelled"""
+        with self.condition:
+            while self.credit <= 0 and not self.cancelled:
+                self.condition.wait()
+            self.credit -= 1
+            return not self.cancelled
+
+
+class _HelperServer:
+    """Serves requests from stdin with a warm InProcessEngine"""
+
+    def __init__(self, output, workers: int):
+        from .engine import InProcessEngine
+        from .ingest import slim_entry, slim_info
+
+        self.engine = InProcessEngine()
+        self.slim_entry = slim_entry
+        self.slim_info = slim_info
+        self.output = output
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="yt-x-helper")
+        self.requests: Dict[int, _ServerRequest] = {}
+        self._lock = threading.Lock()
+
+    def send(self, message: Dict):
+        line = (json.dumps(message) + "\n").encode("utf-8")
+        with self._lock:
+            self.output.write(line)
+            self.output.flush()
+
+    def serve(self, stream):
+        self.send({"id": 0, "ready": True})
+
+        for line in stream:
+            try:
+                message = json.loads(line)
+                request_id = message["id"]
+                op = message["op"]
+            except (ValueError, KeyError):
+                continue
+
+            if op == "cancel" or op == "more":
+                with self._lock:
+                    request = self.requests.get(request_id)
+                if request and op == "cancel":
+                    request.cancel()
+                elif request:
+                    request.grant(int(message.get("count", 0)))
+                continue
+
+            request = _ServerRequest()
+            with self._lock:
+                self.requests[request_id] = request
+            self.executor.submit(self.handle, request_id, request, message)
+
+        # The client closed the pipe or exited
+        for request in list(self.requests.values()):
+            request.cancel()
+        self.executor.shutdown(wait=False)
+        self.engine.close()
+
+    def handle(self, request_id: int, request: _ServerRequest, message: Dict):
+        op, url, args = message["op"], message.get("url", ""), message.get("args", [])
+        try:
+            if op == "extract":
+                # The engine raises on failure, so errors reach the
+                # client as {"error": ...} rather than a null result
+                response = {"result": self.slim_info(self.engine.extract(url, args))}
+            elif op == "resolve":
+                response = {"result": self.engine.resolve_url(url, args)}
+            elif op == "entries":
+                shared = {}
+                for entry in self.engine.iter_entries(url, args):
+                    if not request.take():
+                        return
+                    self.send({"id": request_id, "entry": self.slim_entry(entry, shared)})
+                response = {"done": True}
+            else:
+                response = {"error": f"unknown op {op!r}"}
+
+            if not request.cancelled:
+                self.send(dict(response, id=request_id))
+        except Exception as e:
+            if not request.cancelled:
+                self.send({"id": request_id, "error": str(e) or type(e).__name__})
+        finally:
+            with self._lock:
+                self.requests.pop(request_id, None)
+            # Lets the client stop tracking a request it gave up on
+            if request.cancelled:
+                self.send({"id": request_id, "cancelled": True})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="yt-x yt-dlp helper process")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    # Keep the protocol on a private copy of stdout; anything yt-dlp
+    # prints goes to stderr instead
+    output = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    try:
+        server = _HelperServer(output, args.workers)
+    except Exception as e:
+        output.write((json.dumps({"id": 0, "error": str(e)}) + "\n").encode("utf-8"))
+        output.flush()
+        sys.exit(1)
+
+    server.serve(sys.stdin.buffer)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Local full-text index over every video yt-x has seen
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT,
+    channel TEXT,
+    description TEXT,
+    data TEXT NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5 (
+    title, channel, description,
+    content='videos', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='1 2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS videos_insert AFTER INSERT ON videos BEGIN
+    INSERT INTO videos_fts (rowid, title, channel, description)
+    VALUES (new.rowid, new.title, new.channel, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS videos_delete AFTER DELETE ON videos BEGIN
+    INSERT INTO videos_fts (videos_fts, rowid, title, channel, description)
+    VALUES ('delete', old.rowid, old.title, old.channel, old.description);
+END;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Longest description kept for searching; flat entries rarely carry more
+MAX_DESCRIPTION = 2000
+
+
+def _match_query(text: str) -> Optional[str]:
+    """Turn typed text into an FTS5 query matching every word as a prefix"""
+    words = re.findall(r"\w+", text, re.UNICODE)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class VideoIndex:
+    """SQLite FTS5 index over title, channel and description
+
+    Each video is stored once, keyed by its ID. Seeing a video again
+    re-inserts it, so results come back most recently seen first.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def add_many(self, entries: Iterable[Dict]):
+        """
+        Index entries, replacing older copies of the same videos
+
+        Args:
+            entries: Flat video or channel entries
+        """
+        # Keyed by ID: a batch may list a video twice, and id is unique
+        rows = {}
+        for entry in entries:
+            entry_id = entry.get("id") or entry.get("url")
+            title = entry.get("title") or entry.get("channel")
+            if not entry_id or not title or entry.get("_type") == "playlist":
+                continue
+            entry_id = str(entry_id)
+            # The last copy wins and counts as the most recently seen
+            rows.pop(entry_id, None)
+            rows[entry_id] = (
+                entry_id,
+                title,
+                entry.get("channel") or entry.get("uploader") or "",
+                (entry.get("description") or "")[:MAX_DESCRIPTION],
+                json.dumps(entry),
+            )
+
+        if not rows:
+            return
+        rows = list(rows.values())
+
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("DELETE FROM videos WHERE id = ?", [(row[0],) for row in rows])
+            self._conn.executemany(
+                "INSERT INTO videos (id, title, channel, description, data) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def search(self, text: str, limit: int = 50) -> List[Dict]:
+        """
+        Search the index
+
+        Args:
+            text: Words to look for; the last one may be partially typed
+            limit: Maximum number of results
+
+        Returns:
+            Matching entries, most recently seen first
+        """
+        query = _match_query(text)
+        if not query:
+            return []
+
+        # Ordering by rowid lets FTS5 stop after `limit` matches
+        # instead of scoring every hit
+        with self._lock:
+            try:
+                rows = self._conn.execute(
+                    "SELECT videos.data FROM videos_fts "
+                    "JOIN videos ON videos.rowid = videos_fts.rowid "
+                    "WHERE videos_fts MATCH ? ORDER BY videos_fts.rowid DESC LIMIT ?",
+                    (query, limit)
+                ).fetchall()
+            except sqlite3.OperationalError:
+                return []
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self) -> int:
+        """Get number of indexed entries"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, value)
+            )
+
+    def backfill_from_store(self, store):
+        """One-time import of saved, recent, subscription and feed entries"""
+        if self.get_meta("backfilled_store"):
+            return
+
+        for collection in ("subscriptions", "feed", "saved", "recent"):
+            self.add_many(reversed(store.list(collection)))
+        self.set_meta("backfilled_store", "1")
+
+    def clear(self):
+        """Remove all indexed entries"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM videos")
+            self._conn.execute("INSERT INTO videos_fts (videos_fts) VALUES ('rebuild')")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
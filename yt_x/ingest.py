@@ -0,0 +1,217 @@
+"""
+Memory-lean parsing of yt-dlp JSON output
+"""
+
+import codecs
+import functools
+import json
+import re
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+
+# Fields yt-x reads from entries; everything else yt-dlp emits is dropped
+ENTRY_FIELDS = (
+    "_type", "ie_key", "id", "url", "webpage_url", "title", "description",
+    "channel", "channel_id", "channel_url", "uploader", "uploader_id",
+    "duration", "view_count", "upload_date", "timestamp", "release_timestamp",
+    "live_status", "channel_follower_count", "playlist_count", "thumbnail",
+)
+
+# Fields kept from the playlist, channel or search result around entries
+INFO_FIELDS = (
+    "_type", "id", "title", "webpage_url", "channel", "channel_id",
+    "channel_url", "uploader", "playlist_count", "thumbnail", "entries",
+)
+
+# Values repeated across a channel's or playlist's entries, stored once
+SHARED_FIELDS = (
+    "_type", "ie_key", "channel", "channel_id", "channel_url", "uploader",
+    "uploader_id", "live_status",
+)
+
+MAX_DESCRIPTION = 2000
+
+READ_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Characters that can follow a complete number
+_NUMBER_END = " \t\n\r,]}"
+
+
+@functools.lru_cache(maxsize=None)
+def _backend():
+    """Get the fastest installed JSON parser, orjson if present"""
+    try:
+        import orjson
+        return orjson.loads
+    except ImportError:
+        return json.loads
+
+
+def loads(data) -> Any:
+    """Parse JSON text or bytes with the fastest installed backend"""
+    return _backend()(data)
+
+
+def slim_entry(entry: Dict, shared: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Keep only the fields yt-x uses from a video or channel entry
+
+    Args:
+        entry: Entry as printed by yt-dlp
+        shared: Strings seen so far in the same listing, so values such
+            as the channel name are stored once across its entries
+    """
+    from .thumbnails import thumbnail_url
+
+    # Keys come from ENTRY_FIELDS so every entry shares the same key strings
+    slim = {key: entry[key] for key in ENTRY_FIELDS if key in entry}
+    if shared is not None:
+        for key in SHARED_FIELDS:
+            value = slim.get(key)
+            if type(value) is str:
+                slim[key] = shared.setdefault(value, value)
+
+    # One thumbnail URL instead of yt-dlp's list of every size
+    if "thumbnail" not in slim:
+        thumbnail = thumbnail_url(entry)
+        if thumbnail:
+            slim["thumbnail"] = thumbnail
+
+    description = slim.get("description")
+    if description and len(description) > MAX_DESCRIPTION:
+        slim["description"] = description[:MAX_DESCRIPTION]
+
+    return slim
+
+
+def slim_info(data: Dict) -> Dict:
+    """Slim a -J result: a playlist keeps its entries, a single video is an entry"""
+    if "entries" not in data:
+        return slim_entry(data)
+
+    slim = {key: value for key, value in data.items() if key in INFO_FIELDS}
+    shared = {}
+    slim["entries"] = [slim_entry(entry, shared) for entry in data["entries"] or [] if entry]
+    return slim
+
+
+class _IncrementalReader:
+    """Decodes JSON values from a byte stream as they arrive
+
+    Uses the C-accelerated scanner behind json.JSONDecoder.raw_decode,
+    refilling the buffer when a value is not complete yet. Parsed text
+    is dropped from the buffer, so only the value being read is held.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """Append at least min_size more characters; False at end of stream"""
+        if self.eof:
+            return False
+
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        target = len(self.buffer) + max(min_size, 1)
+        while len(self.buffer) < target:
+            chunk = self.stream.read(READ_SIZE)
+            if not chunk:
+                self.eof = True
+                self.buffer += self.text_decoder.decode(b"", final=True)
+                break
+            self.buffer += self.text_decoder.decode(chunk)
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self) -> str:
+        """Get the next non-whitespace character without consuming it"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, chars: str) -> str:
+        """Consume one of `chars`"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise self._error(f"Expected one of {chars!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number cut off by the chunk boundary decodes as a shorter
+                # one ("212." as 212, "1.5e" as 1.5), so it only counts once
+                # something that ends a number follows it
+                complete = end < len(self.buffer) and (
+                    type(value) not in (int, float) or self.buffer[end] in _NUMBER_END
+                )
+                if complete or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow geometrically so a huge value is not rescanned chunk by chunk
+            self._fill(len(self.buffer) - self.pos)
+
+    def array_items(self) -> Iterator[Any]:
+        """Decode the items of an array one at a time"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+
+def parse_info(stream: BinaryIO) -> Dict:
+    """
+    Parse yt-dlp -J output from a byte stream, slimming as it goes
+
+    Entries are decoded and slimmed one at a time, and other top-level
+    fields yt-x does not use are discarded right after decoding, so the
+    full document is never held in memory.
+
+    Raises:
+        json.JSONDecodeError: If the output is not a JSON object
+    """
+    reader = _IncrementalReader(stream)
+    data = {}
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        return data
+
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "entries" and reader.peek() == "[":
+            shared = {}
+            data["entries"] = [slim_entry(entry, shared) for entry in reader.array_items() if entry]
+        else:
+            value = reader.value()
+            if key in ENTRY_FIELDS or key in INFO_FIELDS or key == "thumbnails":
+                data[key] = value
+        if reader.expect(",}") == "}":
+            break
+
+    if "entries" not in data:
+        return slim_entry(data)
+    return {key: value for key, value in data.items() if key in INFO_FIELDS}
@@ -5,10 +5,15 @@ Handles m3u8 playlists using yt-dlp for deep link resolution
 
 import subprocess
 import tempfile
+import threading
+import time
 import os
-from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Tuple
 from pathlib import Path
 
+from .entry import VideoEntry
+
 
 class Player:
     """Wrapper for video players (mpv, vlc)"""
@@ -20,40 +25,15 @@ class Player:
         self.player_cmd = self._find_player()
         self.temp_dir = Path(tempfile.gettempdir()) / "yt-x"
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self._prefetcher = None
 
     def _find_player(self) -> str:
         """Find video player executable"""
-        if self.player_type.lower() == "mpv":
-            for cmd in ["mpv.exe", "mpv"]:
-                try:
-                    result = subprocess.run(
-                        ["where", cmd],
-                        capture_output=True,
-                        text=True,
-                        shell=True
-                    )
-                    if result.returncode == 0:
-                        return cmd
-                except:
-                    pass
-            return "mpv"
+        from .executables import get_executable_cache
 
-        elif self.player_type.lower() == "vlc":
-            for cmd in ["vlc.exe", "vlc"]:
-                try:
-                    result = subprocess.run(
-                        ["where", cmd],
-                        capture_output=True,
-                        text=True,
-                        shell=True
-                    )
-                    if result.returncode == 0:
-                        return cmd
-                except:
-                    pass
-            return "vlc"
-
-        return "mpv"
+        name = "vlc" if self.player_type.lower() == "vlc" else "mpv"
+        path = get_executable_cache(self.config.cache_dir).find([name, f"{name}.exe"])
+        return path or name
 
     def _resolve_with_ytdlp(self, url: str) -> Tuple[str, Optional[str]]:
         """
@@ -65,68 +45,142 @@ class Player:
         if not self.ytdlp:
             return url, None
 
-        try:
-            import json
-
-            # Get direct stream URL from yt-dlp
-            cmd = [
-                self.ytdlp.yt_dlp_cmd,
-                url,
-                "--get-url",
-                "--get-title",
-                "--no-warnings",
-                "-f", "best"
-            ]
-
-            # Add browser args
-            cmd.extend(self.ytdlp._get_browser_args())
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                shell=True,
-                timeout=30
-            )
+        # Shares the stream URL cache, so replays resolve instantly;
+        # get_video_url traces the call
+        resolved = self.ytdlp.get_video_url(url, timeout=30)
+        if resolved:
+            return resolved, None
+
+        print("Could not resolve video URL, trying direct playback")
+        return url, None
 
-            if result.returncode == 0:
-                lines = result.stdout.strip().split("\n")
-                # Last non-empty line is the URL
-                url_lines = [l for l in lines if l.strip()]
-                if url_lines:
-                    return url_lines[-1].strip(), None
+    @property
+    def resolves_urls(self) -> bool:
+        """Whether yt-x resolves stream URLs itself before playback"""
+        # mpv resolves URLs through its own yt-dlp hook
+        return self.ytdlp is not None and self.player_type.lower() == "vlc"
 
-        except subprocess.TimeoutExpired:
-            print("Timeout resolving video URL, trying direct playback")
-        except Exception as e:
-            print(f"Error resolving URL: {e}, trying direct playback")
+    def prefetch(self, urls: list):
+        """
+        Resolve stream URLs in the background so playback starts instantly
 
-        return url, None
+        Args:
+            urls: Video URLs, most likely to be played first
+        """
+        if not self.resolves_urls or not self.config.get("PREFETCH_STREAMS", True):
+            return
+
+        if self._prefetcher is None:
+            from .prefetch import StreamPrefetcher
+            self._prefetcher = StreamPrefetcher(
+                lambda url: self.ytdlp.get_video_url(url, timeout=30),
+                max_workers=int(self.config.get("PREFETCH_WORKERS", 2))
+            )
+
+        self._prefetcher.prefetch(urls)
+
+    def cancel_prefetch(self):
+        """Cancel queued background resolutions"""
+        if self._prefetcher:
+            self._prefetcher.cancel()
 
-    def _create_m3u8_playlist(self, video_urls: list, titles: list = None) -> str:
+    def _create_m3u8_playlist(self, video_urls: list, titles: list = None, name: Optional[str] = None) -> str:
         """
         Create m3u8 playlist file for VLC
 
         Args:
             video_urls: List of video URLs
             titles: Optional list of video titles
+            name: File name, defaults to one per process
 
         Returns:
             Path to m3u8 playlist file
         """
-        playlist_path = self.temp_dir / f"playlist_{os.getpid()}.m3u8"
+        playlist_path = self.temp_dir / (name or f"playlist_{os.getpid()}.m3u8")
 
         with open(playlist_path, "w", encoding="utf-8") as f:
             f.write("#EXTM3U\n")
-
-            for i, url in enumerate(video_urls):
-                if titles and i < len(titles):
-                    title = titles[i]
-                    f.write(f"#EXTINF:-1,{title}\n")
-                f.write(f"{url}\n")
+            self._write_m3u8_entries(f, video_urls, titles)
 
         return str(playlist_path)
 
+    def _append_m3u8_playlist(self, playlist_path: str, video_urls: list, titles: list = None):
+        """Append entries to an existing m3u8 playlist file"""
+        with open(playlist_path, "a", encoding="utf-8") as f:
+            self._write_m3u8_entries(f, video_urls, titles)
+
+    def _write_m3u8_entries(self, f, video_urls: list, titles: list = None):
+        """Write m3u8 entries to an open file"""
+        for i, url in enumerate(video_urls):
+            if titles and i < len(titles):
+                title = titles[i]
+                f.write(f"#EXTINF:-1,{title}\n")
+            f.write(f"{url}\n")
+
+    def _resolve_playlist(self, video_urls: list) -> Iterator[str]:
+        """
+        Resolve playlist URLs concurrently
+
+        Yields:
+            Stream URLs in playlist order, falling back to the original URL
+        """
+        workers = int(self.config.get("PLAYLIST_RESOLVE_WORKERS", 8))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="yt-x-playlist")
+        futures = [executor.submit(self.ytdlp.get_video_url, url, None, False, 30) for url in video_urls]
+
+        try:
+            for url, future in zip(video_urls, futures):
+                try:
+                    yield future.result() or url
+                except Exception:
+                    yield url
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _enqueue_remaining(self, resolved: Iterator[str], titles: list, m3u8_path: str, audio_only: bool):
+        """Append resolved entries to the playlist and enqueue them in VLC"""
+        batch_size = int(self.config.get("PLAYLIST_ENQUEUE_BATCH", 10))
+        batch_urls, batch_titles = [], []
+        chunk = 0
+
+        # Give VLC time to open its single-instance channel, otherwise
+        # the first enqueue would start a second player
+        time.sleep(float(self.config.get("PLAYLIST_ENQUEUE_DELAY", 2)))
+
+        def flush():
+            nonlocal chunk
+            self._append_m3u8_playlist(m3u8_path, batch_urls, batch_titles)
+            chunk += 1
+            chunk_path = self._create_m3u8_playlist(
+                batch_urls, batch_titles, name=f"playlist_{os.getpid()}_{chunk}.m3u8"
+            )
+            cmd = [self.player_cmd, "--one-instance", "--playlist-enqueue"]
+            if audio_only:
+                cmd.extend(["--no-video"])
+            cmd.append(chunk_path)
+            try:
+                subprocess.run(cmd, timeout=30)
+            except Exception as e:
+                print(f"Error adding to playlist: {e}")
+            finally:
+                # VLC has read the chunk into its playlist by now
+                try:
+                    os.unlink(chunk_path)
+                except OSError:
+                    pass
+
+        for url, title in zip(resolved, titles):
+            batch_urls.append(url)
+            batch_titles.append(title)
+            if len(batch_urls) >= batch_size:
+                flush()
+                batch_urls, batch_titles = [], []
+
+        if batch_urls:
+            flush()
+
     def _get_playlist_urls(self, playlist_url: str) -> Tuple[list, list]:
         """
         Get all video URLs from playlist using yt-dlp
@@ -138,17 +192,16 @@ class Player:
             return [playlist_url], []
 
         try:
-            import json
-
             # Get playlist data
             data = self.ytdlp.fetch_json(playlist_url, flat=True)
 
             if not data or "entries" not in data:
                 return [playlist_url], []
 
-            entries = data["entries"]
-            urls = [entry.get("url") or entry.get("webpage_url") for entry in entries if entry.get("url") or entry.get("webpage_url")]
-            titles = [entry.get("title", "Unknown") for entry in entries]
+            entries = [VideoEntry.from_dict(entry) for entry in data["entries"]]
+            entries = [entry for entry in entries if entry.url]
+            urls = [entry.url for entry in entries]
+            titles = [entry.title or "Unknown" for entry in entries]
 
             return urls, titles
 
@@ -229,10 +282,22 @@ class Player:
         print(f"Creating playlist with {len(video_urls)} videos...")
 
         if self.player_type.lower() == "vlc":
-            # Create m3u8 playlist for VLC
-            m3u8_path = self._create_m3u8_playlist(video_urls, titles)
+            # Resolve in parallel and start playing once the first few are ready
+            resolved = self._resolve_playlist(video_urls) if self.ytdlp else iter(video_urls)
+            titles = list(titles) + ["Unknown"] * (len(video_urls) - len(titles))
+            start_after = min(int(self.config.get("PLAYLIST_START_AFTER", 3)), len(video_urls))
+
+            first_urls = [next(resolved) for _ in range(start_after)]
+            m3u8_path = self._create_m3u8_playlist(first_urls, titles[:start_after])
+
+            # The rest is enqueued into the running VLC as it resolves
+            enqueue = threading.Thread(
+                target=self._enqueue_remaining,
+                args=(resolved, titles[start_after:], m3u8_path, audio_only),
+                daemon=True
+            )
 
-            cmd = [self.player_cmd]
+            cmd = [self.player_cmd, "--one-instance"]
 
             if audio_only:
                 cmd.extend(["--no-video"])
@@ -247,8 +312,10 @@ class Player:
                         creationflags=subprocess.DETACHED_PROCESS,
                         close_fds=True
                     )
+                    enqueue.start()
                     print(f"Playing playlist with {len(video_urls)} videos in VLC")
                 else:
+                    enqueue.start()
                     subprocess.run(cmd, shell=True)
             except Exception as e:
                 print(f"Error playing playlist: {e}")
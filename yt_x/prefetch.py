@@ -0,0 +1,63 @@
+"""
+Speculative stream URL resolution
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+
+class StreamPrefetcher:
+    """Resolves stream URLs ahead of time in a bounded worker pool
+
+    Each call to prefetch() supersedes the previous one: queued
+    resolutions that have not started yet are cancelled, so moving the
+    cursor quickly never piles up work.
+    """
+
+    def __init__(self, resolve: Callable[[str], Optional[str]], max_workers: int = 2):
+        self._resolve = resolve
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="yt-x-prefetch")
+        self._pending: List[Future] = []
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def prefetch(self, urls: List[str]):
+        """
+        Resolve URLs in the background, most likely first
+
+        Args:
+            urls: Video URLs in priority order
+        """
+        with self._lock:
+            self._cancel_pending()
+            generation = self._generation
+            self._pending = [
+                self._executor.submit(self._run, generation, url)
+                for url in urls if url
+            ]
+
+    def cancel(self):
+        """Cancel all resolutions that have not started yet"""
+        with self._lock:
+            self._cancel_pending()
+
+    def _cancel_pending(self):
+        self._generation += 1
+        for future in self._pending:
+            future.cancel()
+        self._pending = []
+
+    def _run(self, generation: int, url: str):
+        # Skip work that was superseded while waiting for a worker
+        if generation != self._generation:
+            return
+        try:
+            self._resolve(url)
+        except Exception:
+            pass
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        self.cancel()
+        self._executor.shutdown(wait=False)
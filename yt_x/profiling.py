@@ -0,0 +1,107 @@
+"""
+Startup profiler for --profile-startup
+"""
+
+import builtins
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class StartupProfiler:
+    """Records import times and named startup phases
+
+    Imports are timed by wrapping __import__. Each module's own time
+    excludes the modules it imports, and is added up per top-level
+    package so the report shows which dependency is slow.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.imports: Dict[str, float] = {}
+        self._original_import = None
+        # Time spent in nested imports, per nesting level and thread
+        self._local = threading.local()
+
+    def install(self):
+        """Start timing imports"""
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original_import:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        full_name = name
+        if level:
+            package = (globals or {}).get("__package__") or ""
+            base = package.rsplit(".", level - 1)[0] if level > 1 else package
+            full_name = f"{base}.{name}" if name else base
+
+        # Only first imports cost anything worth reporting
+        if full_name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        child_time = self._local.__dict__.setdefault("child_time", [])
+        child_time.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            own = elapsed - child_time.pop()
+            if child_time:
+                child_time[-1] += elapsed
+            top_level = full_name.split(".")[0]
+            self.imports[top_level] = self.imports.get(top_level, 0.0) + own
+
+    def mark(self, phase: str):
+        """Record that a phase finished"""
+        self.phases.append((phase, time.perf_counter()))
+
+    def report(self, top: int = 15) -> str:
+        """Format the import and phase breakdown"""
+        lines = ["", "Startup profile", "", "Phases:"]
+        previous = self.start
+        for phase, at in self.phases:
+            lines.append(f"  {phase:<32} {(at - previous) * 1000:8.1f} ms  (at {(at - self.start) * 1000:.1f} ms)")
+            previous = at
+
+        total = sum(self.imports.values())
+        lines.extend(["", f"Imports ({total * 1000:.1f} ms total, slowest packages):"])
+        ordered = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)
+        for package, seconds in ordered[:top]:
+            lines.append(f"  {package:<32} {seconds * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+_profiler: Optional[StartupProfiler] = None
+
+
+def enable() -> StartupProfiler:
+    """Start profiling this process"""
+    global _profiler
+    _profiler = StartupProfiler()
+    _profiler.install()
+    return _profiler
+
+
+def enabled() -> bool:
+    return _profiler is not None
+
+
+def mark(phase: str):
+    """Record a phase if profiling is enabled"""
+    if _profiler:
+        _profiler.mark(phase)
+
+
+def report():
+    """Print the profile if profiling is enabled"""
+    if _profiler:
+        _profiler.uninstall()
+        print(_profiler.report())
@@ -0,0 +1,308 @@
+"""
+SQLite store for saved, recent, subscription and search history data
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    collection TEXT NOT NULL,
+    id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (collection, id)
+);
+CREATE INDEX IF NOT EXISTS entries_order ON entries (collection, seq);
+
+CREATE TABLE IF NOT EXISTS collections (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS search_history (
+    query TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS search_history_order ON search_history (seq);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class LibraryStore:
+    """Indexed store for the user's video collections
+
+    Entries live in named collections ("saved", "recent",
+    "subscriptions"), keyed by video or channel ID and ordered by a
+    per-collection sequence number, newest first.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def _next_seq(self, table: str, collection: Optional[str] = None) -> int:
+        """Get the next sequence number (uses the ordering index)"""
+        if collection is None:
+            row = self._conn.execute(f"SELECT MAX(seq) FROM {table}").fetchone()
+        else:
+            row = self._conn.execute(
+                f"SELECT MAX(seq) FROM {table} WHERE collection = ?", (collection,)
+            ).fetchone()
+        return (row[0] or 0) + 1
+
+    def upsert(self, collection: str, entry_id: str, data: Dict, limit: Optional[int] = None):
+        """
+        Insert or move an entry to the front of a collection
+
+        Args:
+            collection: Collection name
+            entry_id: Video or channel ID
+            data: Entry data
+            limit: Keep only this many newest entries
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            seq = self._next_seq("entries", collection)
+            updated = self._conn.execute(
+                "UPDATE entries SET seq = ?, data = ? WHERE collection = ? AND id = ?",
+                (seq, json.dumps(data), collection, entry_id)
+            ).rowcount
+            if not updated:
+                self._conn.execute(
+                    "INSERT INTO entries (collection, id, seq, data) VALUES (?, ?, ?, ?)",
+                    (collection, entry_id, seq, json.dumps(data))
+                )
+                self._add_size(collection, 1)
+            if limit is not None:
+                self._trim(collection, limit)
+
+    def upsert_many(self, collection: str, items: List[Tuple[str, int, Dict]], limit: Optional[int] = None):
+        """
+        Insert or update entries with explicit ordering keys
+
+        Args:
+            collection: Collection name
+            items: (entry_id, seq, data) tuples; higher seq sorts first
+            limit: Keep only this many newest entries
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            for entry_id, seq, data in items:
+                updated = self._conn.execute(
+                    "UPDATE entries SET seq = ?, data = ? WHERE collection = ? AND id = ?",
+                    (seq, json.dumps(data), collection, entry_id)
+                ).rowcount
+                if not updated:
+                    self._conn.execute(
+                        "INSERT INTO entries (collection, id, seq, data) VALUES (?, ?, ?, ?)",
+                        (collection, entry_id, seq, json.dumps(data))
+                    )
+                    self._add_size(collection, 1)
+            if limit is not None:
+                self._trim(collection, limit)
+
+    def _size(self, collection: str) -> int:
+        row = self._conn.execute(
+            "SELECT size FROM collections WHERE name = ?", (collection,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _add_size(self, collection: str, delta: int):
+        self._conn.execute(
+            "INSERT INTO collections (name, size) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET size = size + excluded.size",
+            (collection, delta)
+        )
+
+    def _recount(self, collection: str):
+        """Recompute a collection's size after bulk changes"""
+        size = self._conn.execute(
+            "SELECT COUNT(*) FROM entries WHERE collection = ?", (collection,)
+        ).fetchone()[0]
+        self._conn.execute(
+            "INSERT OR REPLACE INTO collections (name, size) VALUES (?, ?)", (collection, size)
+        )
+
+    def _trim(self, collection: str, limit: int):
+        """Delete the oldest entries beyond `limit`"""
+        excess = self._size(collection) - limit
+        if excess <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM entries WHERE rowid IN ("
+            "SELECT rowid FROM entries WHERE collection = ? ORDER BY seq ASC LIMIT ?)",
+            (collection, excess)
+        )
+        self._add_size(collection, -excess)
+
+    def remove(self, collection: str, entry_id: str):
+        """Remove an entry from a collection"""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            removed = self._conn.execute(
+                "DELETE FROM entries WHERE collection = ? AND id = ?", (collection, entry_id)
+            ).rowcount
+            if removed:
+                self._add_size(collection, -removed)
+
+    def replace(self, collection: str, entries: List[Dict], key: str = "id"):
+        """
+        Replace a whole collection
+
+        Args:
+            collection: Collection name
+            entries: Entries, newest first
+            key: Field holding each entry's ID
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM entries WHERE collection = ?", (collection,))
+            self._insert_many(collection, entries, key)
+            self._recount(collection)
+
+    def _insert_many(self, collection: str, entries: List[Dict], key: str):
+        """Insert entries (newest first) below the current sequence"""
+        base = self._next_seq("entries", collection) + len(entries)
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO entries (collection, id, seq, data) VALUES (?, ?, ?, ?)",
+            [
+                (collection, str(entry.get(key) or entry.get("url")), base - i, json.dumps(entry))
+                for i, entry in enumerate(entries)
+                if entry.get(key) or entry.get("url")
+            ]
+        )
+
+    def list(self, collection: str, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """
+        Read entries of a collection, newest first
+
+        Args:
+            collection: Collection name
+            limit: Maximum number of entries
+            offset: Number of entries to skip
+
+        Returns:
+            List of entry dictionaries
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM entries WHERE collection = ? ORDER BY seq DESC LIMIT ? OFFSET ?",
+                (collection, -1 if limit is None else limit, offset)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def contains(self, collection: str, entry_id: str) -> bool:
+        """Check if a collection has an entry"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM entries WHERE collection = ? AND id = ?", (collection, entry_id)
+            ).fetchone()
+        return row is not None
+
+    def count(self, collection: str) -> int:
+        """Get number of entries in a collection"""
+        with self._lock:
+            return self._size(collection)
+
+    def add_search(self, query: str, limit: Optional[int] = None):
+        """Add a query to the front of the search history"""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            seq = self._next_seq("search_history")
+            self._conn.execute(
+                "INSERT INTO search_history (query, seq) VALUES (?, ?) "
+                "ON CONFLICT (query) DO UPDATE SET seq = excluded.seq",
+                (query, seq)
+            )
+            if limit is not None:
+                self._conn.execute(
+                    "DELETE FROM search_history WHERE seq <= ("
+                    "SELECT seq FROM search_history ORDER BY seq DESC LIMIT 1 OFFSET ?)",
+                    (limit,)
+                )
+
+    def get_searches(self, limit: Optional[int] = None) -> List[str]:
+        """Get search history, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query FROM search_history ORDER BY seq DESC LIMIT ?",
+                (-1 if limit is None else limit,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def clear_searches(self):
+        """Clear search history"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM search_history")
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, value)
+            )
+
+    def migrate_from_files(self, config):
+        """
+        One-time import of the JSON and text files used before the store
+
+        The old files are left in place untouched.
+        """
+        if self.get_meta("migrated_files"):
+            return
+
+        def read_entries(path: Path) -> List[Dict]:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f).get("entries", [])
+            except (json.JSONDecodeError, IOError, AttributeError):
+                return []
+
+        searches = []
+        try:
+            with open(config.search_history_file, "r", encoding="utf-8") as f:
+                searches = [line.strip() for line in f if line.strip()]
+        except IOError:
+            pass
+
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            for collection, path in (
+                ("saved", config.saved_videos_file),
+                ("recent", config.recent_videos_file),
+                ("subscriptions", config.subscriptions_file),
+            ):
+                self._insert_many(collection, read_entries(path), "id")
+                self._recount(collection)
+
+            base = self._next_seq("search_history") + len(searches)
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO search_history (query, seq) VALUES (?, ?)",
+                [(query, base - i) for i, query in enumerate(searches)]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_files', '1')"
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
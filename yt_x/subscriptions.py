@@ -0,0 +1,245 @@
+"""
+Incremental subscription feed sync
+"""
+
+import json
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+RSS_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={}"
+
+NAMESPACES = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "yt": "http://www.youtube.com/xml/schemas/2015",
+    "media": "http://search.yahoo.com/mrss/",
+}
+
+
+def _parse_timestamp(value: str) -> Optional[int]:
+    """Parse an RSS timestamp like 2024-05-01T12:00:00+00:00"""
+    from datetime import datetime
+
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+class SubscriptionSync:
+    """Builds one subscription feed from every subscribed channel
+
+    Channels are fetched concurrently. Each channel remembers the newest
+    video seen on the previous sync (its watermark), and only videos
+    newer than that are merged into the feed. Channels with a known
+    channel ID use YouTube's RSS feed with conditional requests, so an
+    unchanged channel costs one small HTTP round trip. Other channels
+    fall back to a short yt-dlp listing of their uploads.
+    """
+
+    FEED = "feed"
+
+    def __init__(self, config, ytdlp):
+        self.config = config
+        self.ytdlp = ytdlp
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Shared keep-alive HTTP session"""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                workers = int(self.config.get("SUBSCRIPTION_SYNC_WORKERS", 8))
+                self._session = requests.Session()
+                self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=workers))
+            return self._session
+
+    def get_feed(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """Get synced feed entries, newest first"""
+        return self.config.store.list(self.FEED, limit=limit, offset=offset)
+
+    def sync(
+        self,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> int:
+        """
+        Fetch new uploads from all subscriptions
+
+        Args:
+            progress: Called with (channels_done, channels_total)
+            cancel: Stops the sync when set
+
+        Returns:
+            Number of new videos added to the feed
+        """
+        channels = self.config.get_subscriptions()
+        store = self.config.store
+        workers = int(self.config.get("SUBSCRIPTION_SYNC_WORKERS", 8))
+        feed_size = int(self.config.get("SUBSCRIPTION_FEED_SIZE", 1000))
+
+        added = 0
+        done = 0
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="yt-x-sync") as executor:
+            futures = {executor.submit(self._sync_channel, channel, cancel): channel for channel in channels}
+
+            for future in as_completed(futures):
+                done += 1
+                try:
+                    channel_key, items, state = future.result()
+                except Exception as e:
+                    print(f"Error syncing {futures[future].get('channel', 'channel')}: {e}")
+                    items, state = [], None
+
+                if items:
+                    store.upsert_many(self.FEED, items, limit=feed_size)
+                    self.config.index_entries([data for _, _, data in items])
+                    added += len(items)
+                if state:
+                    store.set_meta(f"subscription:{channel_key}", json.dumps(state))
+
+                if progress:
+                    progress(done, len(channels))
+
+                if cancel and cancel.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+        return added
+
+    def _channel_key(self, channel: Dict) -> str:
+        return str(channel.get("channel_id") or channel.get("id") or channel.get("url"))
+
+    def _channel_id(self, channel: Dict) -> Optional[str]:
+        """Get the UC... channel ID, if known"""
+        for value in (channel.get("channel_id"), channel.get("id"), channel.get("channel_url"), channel.get("url")):
+            match = re.search(r"(UC[\w-]{22})", value or "")
+            if match:
+                return match.group(1)
+        return None
+
+    def _uploads_url(self, channel: Dict) -> str:
+        url = channel.get("channel_url") or channel.get("url") or ""
+        if not url:
+            return f"https://www.youtube.com/channel/{channel.get('id')}/videos"
+        if "youtube.com" in url and not re.search(r"/(videos|streams|shorts)/?$", url):
+            url = url.rstrip("/") + "/videos"
+        return url
+
+    def _sync_channel(self, channel: Dict, cancel: Optional[threading.Event]) -> Tuple[str, List, Optional[Dict]]:
+        """
+        Fetch uploads newer than the channel's watermark
+
+        Returns:
+            Tuple of (channel_key, feed_items, new_state)
+        """
+        key = self._channel_key(channel)
+        if cancel and cancel.is_set():
+            return key, [], None
+
+        raw_state = self.config.store.get_meta(f"subscription:{key}")
+        state = json.loads(raw_state) if raw_state else {}
+        watermark = state.get("watermark")
+
+        entries = None
+        channel_id = self._channel_id(channel)
+        if channel_id:
+            try:
+                entries, etag = self._fetch_rss(channel_id, state.get("etag"))
+                if entries is None:
+                    # Not modified since the last sync
+                    return key, [], None
+                state["etag"] = etag
+            except Exception:
+                entries = None
+
+        if entries is None:
+            entries = self._fetch_uploads(channel, watermark)
+
+        new_entries = []
+        for entry in entries:
+            if entry.get("id") == watermark:
+                break
+            new_entries.append(entry)
+
+        if entries:
+            state["watermark"] = entries[0].get("id")
+
+        # Order by upload time; fall back to list position for undated entries
+        now = int(time.time())
+        items = []
+        for position, entry in enumerate(new_entries):
+            entry_id = entry.get("id") or entry.get("url")
+            if not entry_id:
+                continue
+            entry.setdefault("channel", channel.get("channel") or channel.get("title"))
+            timestamp = entry.get("timestamp") or now - position
+            items.append((entry_id, int(timestamp), entry))
+
+        return key, items, state
+
+    def _fetch_rss(self, channel_id: str, etag: Optional[str]) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        """
+        Fetch a channel's RSS feed
+
+        Returns:
+            Tuple of (entries, etag); entries is None if not modified
+        """
+        headers = {"If-None-Match": etag} if etag else {}
+        response = self.session.get(RSS_URL.format(channel_id), headers=headers, timeout=15)
+        if response.status_code == 304:
+            return None, etag
+        response.raise_for_status()
+
+        root = ET.fromstring(response.content)
+        entries = []
+        for item in root.findall("atom:entry", NAMESPACES):
+            video_id = item.findtext("yt:videoId", namespaces=NAMESPACES)
+            if not video_id:
+                continue
+            stats = item.find("media:group/media:community/media:statistics", NAMESPACES)
+            entries.append({
+                "_type": "url",
+                "ie_key": "Youtube",
+                "id": video_id,
+                "url": f"https://www.youtube.com/watch?v={video_id}",
+                "title": item.findtext("atom:title", namespaces=NAMESPACES),
+                "channel": item.findtext("atom:author/atom:name", namespaces=NAMESPACES),
+                "channel_id": channel_id,
+                "timestamp": _parse_timestamp(item.findtext("atom:published", namespaces=NAMESPACES)),
+                "view_count": int(stats.get("views", 0)) if stats is not None else None,
+            })
+
+        return entries, response.headers.get("ETag")
+
+    def _fetch_uploads(self, channel: Dict, watermark: Optional[str]) -> List[Dict]:
+        """List a channel's latest uploads with yt-dlp, stopping at the watermark"""
+        depth = int(self.config.get("SUBSCRIPTION_SYNC_DEPTH", 30))
+        entries = []
+
+        stream = self.ytdlp.stream_playlist(
+            self._uploads_url(channel),
+            end=depth,
+            extra_args=["--extractor-args", "youtubetab:approximate_date"],
+            refresh=True
+        )
+        try:
+            for entry in stream:
+                entries.append(entry)
+                if entry.get("id") == watermark:
+                    break
+        finally:
+            # Stops yt-dlp once the watermark is reached
+            stream.close()
+
+        return entries
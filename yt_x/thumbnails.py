@@ -0,0 +1,377 @@
+"""
+Thumbnail fetching with a pooled HTTP session and a bounded disk cache
+"""
+
+import hashlib
+import heapq
+import itertools
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from .cache import video_id_from_url
+
+
+# Priorities for queued fetches, lowest first
+VISIBLE = 0
+OFFSCREEN = 1
+
+
+def thumbnail_url(video: Dict) -> Optional[str]:
+    """
+    Get a thumbnail URL from a flat entry without running yt-dlp
+
+    Args:
+        video: Flat playlist or search entry
+
+    Returns:
+        Thumbnail URL, or None if there is no way to tell
+    """
+    # Flat entries list thumbnails smallest first; the middle one is
+    # plenty for a terminal preview and much smaller than maxresdefault
+    thumbnails = [t for t in video.get("thumbnails") or [] if t.get("url")]
+    if thumbnails:
+        return thumbnails[len(thumbnails) // 2]["url"]
+
+    if video.get("thumbnail"):
+        return video["thumbnail"]
+
+    video_id = video.get("id")
+    if not video_id and video.get("url"):
+        video_id = video_id_from_url(video["url"])
+        if video_id == video["url"]:
+            video_id = None
+
+    if video_id and len(video_id) == 11:
+        return f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg"
+
+    return None
+
+
+class ThumbnailCache:
+    """Content-addressed image store with LRU eviction
+
+    Images are stored once per content hash under objects/, so the many
+    identical placeholder thumbnails share one file. refs/ maps each
+    thumbnail URL to the hash of its image.
+
+    Like MetadataCache, the size of objects/ is counted once and kept up
+    to date on each write; it is only scanned again to evict. The refs
+    of each image are read once, at the first eviction, and then kept
+    in memory, so evicting only touches the refs of evicted images.
+    """
+
+    # Eviction stops once the cache is down to this share of max_size
+    EVICT_TARGET = 0.9
+
+    def __init__(self, cache_dir: Path, max_size: int):
+        self.objects_dir = Path(cache_dir) / "thumbnails" / "objects"
+        self.refs_dir = Path(cache_dir) / "thumbnails" / "refs"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.refs_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self._size: Optional[int] = None
+        # Image hash -> names of refs to it, built at the first eviction
+        self._refs: Optional[Dict[str, Set[str]]] = None
+        self._lock = threading.Lock()
+
+    def _ref_path(self, url: str) -> Path:
+        return self.refs_dir / hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[Path]:
+        """
+        Get the cached image for a thumbnail URL
+
+        Returns:
+            Path to the image, or None if it is not cached
+        """
+        ref_path = self._ref_path(url)
+        try:
+            digest = ref_path.read_text(encoding="ascii").strip()
+        except OSError:
+            return None
+
+        path = self.objects_dir / f"{digest}.jpg"
+        try:
+            # Mark as recently used for LRU eviction
+            os.utime(path)
+        except OSError:
+            # The image was evicted; drop the ref pointing at it
+            try:
+                ref_path.unlink()
+            except OSError:
+                pass
+            return None
+        return path
+
+    def set(self, url: str, content: bytes) -> Optional[Path]:
+        """
+        Store an image
+
+        Args:
+            url: Thumbnail URL the image was fetched from
+            content: Image bytes
+
+        Returns:
+            Path to the stored image
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.objects_dir / f"{digest}.jpg"
+
+        ref_path = self._ref_path(url)
+        added = 0
+        try:
+            if not path.exists():
+                tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                with open(tmp_path, "wb") as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+                added = len(content)
+            ref_path.write_text(digest, encoding="ascii")
+        except OSError as e:
+            print(f"Error writing thumbnail cache: {e}")
+            return None
+
+        self._track(added, digest, ref_path.name)
+        return path
+
+    def _track(self, delta: int, digest: str, ref: str):
+        """Apply a change to the size of objects/, evicting once over the cap"""
+        with self._lock:
+            if self._refs is not None:
+                self._refs.setdefault(digest, set()).add(ref)
+
+            if self._size is None:
+                # First change: count what is on disk, which includes it
+                self._size = 0
+                for entry in os.scandir(self.objects_dir):
+                    try:
+                        self._size += entry.stat().st_size
+                    except OSError:
+                        continue
+            else:
+                self._size += delta
+
+            if self._size > self.max_size:
+                self._evict()
+
+    def _evict(self):
+        """Remove least recently used images and their refs until under the size cap"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.objects_dir):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        target = self.max_size * self.EVICT_TARGET
+        evicted = set()
+        entries.sort()
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+                evicted.add(Path(path).stem)
+            except OSError:
+                pass
+        self._size = total
+
+        if not evicted:
+            return
+        if self._refs is None:
+            self._refs = self._scan_refs()
+        for digest in evicted:
+            for ref in self._refs.pop(digest, ()):
+                ref_path = self.refs_dir / ref
+                try:
+                    # The URL may have been stored again with another image since
+                    if ref_path.read_text(encoding="ascii").strip() == digest:
+                        ref_path.unlink()
+                except (OSError, ValueError):
+                    continue
+
+    def _scan_refs(self) -> Dict[str, Set[str]]:
+        """Read every ref to map image hashes to the refs pointing at them"""
+        refs: Dict[str, Set[str]] = {}
+        for entry in os.scandir(self.refs_dir):
+            try:
+                with open(entry.path, "r", encoding="ascii") as f:
+                    refs.setdefault(f.read().strip(), set()).add(entry.name)
+            except (OSError, ValueError):
+                continue
+        return refs
+
+    def clear(self):
+        """Remove all cached images"""
+        with self._lock:
+            for directory in (self.objects_dir, self.refs_dir):
+                for entry in os.scandir(directory):
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+            self._size = 0
+            self._refs = {}
+
+
+class ThumbnailFetcher:
+    """Downloads thumbnails in a worker pool over keep-alive connections
+
+    Fetches are served highest priority first. Each call to
+    set_visible() moves the given URLs to the front and pushes
+    everything else still queued behind them, so rows scrolled
+    off-screen are fetched last instead of being dropped.
+    """
+
+    TIMEOUT = 10
+
+    def __init__(self, config, max_workers: int = 4):
+        self.cache = ThumbnailCache(
+            config.cache_dir,
+            int(config.get("THUMBNAIL_CACHE_SIZE_MB", 50)) * 1024 * 1024
+        )
+        self.max_workers = max_workers
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._heap: List = []
+        self._queued: Dict[str, int] = {}
+        self._callbacks: Dict[str, List[Callable[[str, Path], None]]] = {}
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopped = False
+
+    def _start(self):
+        """Start worker threads on first use"""
+        if self._threads:
+            return
+        for i in range(self.max_workers):
+            thread = threading.Thread(target=self._work, name=f"yt-x-thumbnail-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def get(self, url: str, callback: Optional[Callable[[str, Path], None]] = None,
+            priority: int = VISIBLE) -> Optional[Path]:
+        """
+        Get a thumbnail, fetching it in the background if needed
+
+        Args:
+            url: Thumbnail URL
+            callback: Called from a worker thread with (url, path) once fetched
+            priority: VISIBLE or OFFSCREEN
+
+        Returns:
+            Path to the image if it is already cached, otherwise None
+        """
+        path = self.cache.get(url)
+        if path:
+            return path
+
+        with self._condition:
+            if self._stopped:
+                return None
+            if callback:
+                self._callbacks.setdefault(url, []).append(callback)
+            self._push(url, priority)
+            self._start()
+            self._condition.notify()
+        return None
+
+    def set_visible(self, urls: Iterable[str]):
+        """
+        Fetch these URLs first and deprioritize everything else queued
+
+        Cached URLs are queued too; the workers find them in the cache,
+        so this never touches the disk on the caller's thread.
+
+        Args:
+            urls: Thumbnail URLs of the rows on screen, top to bottom
+        """
+        urls = [url for url in urls if url]
+        with self._condition:
+            if self._stopped:
+                return
+            visible = set(urls)
+            offscreen = [url for url in self._queued if url not in visible]
+            self._heap = []
+            self._queued = {}
+            for url in urls:
+                self._push(url, VISIBLE)
+            for url in offscreen:
+                self._push(url, OFFSCREEN)
+            if self._heap:
+                self._start()
+                self._condition.notify_all()
+
+    def _push(self, url: str, priority: int):
+        """Queue a URL, keeping its best priority; caller holds the lock"""
+        if url in self._queued and self._queued[url] <= priority:
+            return
+        self._queued[url] = priority
+        heapq.heappush(self._heap, (priority, next(self._counter), url))
+
+    def _next(self) -> Optional[str]:
+        """Wait for the next URL to fetch"""
+        with self._condition:
+            while True:
+                if self._stopped:
+                    return None
+                while self._heap:
+                    priority, _, url = heapq.heappop(self._heap)
+                    # Skip stale heap entries left by reprioritization
+                    if self._queued.get(url) == priority:
+                        del self._queued[url]
+                        return url
+                self._condition.wait()
+
+    def _work(self):
+        while True:
+            url = self._next()
+            if url is None:
+                return
+
+            path = self.cache.get(url) or self._download(url)
+
+            with self._condition:
+                callbacks = self._callbacks.pop(url, [])
+            if not path:
+                continue
+            for callback in callbacks:
+                try:
+                    callback(url, path)
+                except Exception:
+                    pass
+
+    def _download(self, url: str) -> Optional[Path]:
+        """Download an image into the cache"""
+        import requests
+
+        try:
+            response = self.session.get(url, timeout=self.TIMEOUT)
+            response.raise_for_status()
+        except requests.RequestException:
+            return None
+        return self.cache.set(url, response.content)
+
+    def shutdown(self):
+        """Stop the workers and close pooled connections"""
+        with self._condition:
+            self._stopped = True
+            self._heap = []
+            self._queued = {}
+            self._callbacks = {}
+            self._condition.notify_all()
+        self.session.close()
@@ -0,0 +1,152 @@
+"""
+Per-call tracing of yt-dlp activity
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .cache import classify_url
+
+
+class TraceSpan:
+    """Timings and outcome of one operation
+
+    Callers fill in what they can measure: ttfb, stdout_bytes,
+    parse_time, exit_code and cache ("hit" or "miss"). Times are in
+    seconds.
+    """
+
+    __slots__ = ("op", "url_kind", "started", "wall", "ttfb", "stdout_bytes",
+                 "parse_time", "exit_code", "cache", "error")
+
+    def __init__(self, op: str, url: str):
+        self.op = op
+        self.url_kind = classify_url(url) if url else None
+        self.started = time.perf_counter()
+        self.wall = None
+        self.ttfb = None
+        self.stdout_bytes = None
+        self.parse_time = None
+        self.exit_code = None
+        self.cache = None
+        self.error = None
+
+    def since_start(self) -> float:
+        return time.perf_counter() - self.started
+
+    def to_dict(self) -> Dict:
+        record = {"ts": round(time.time(), 3)}
+        for name in self.__slots__:
+            if name != "started":
+                record[name] = getattr(self, name)
+        return record
+
+
+class Tracer:
+    """Appends one JSON line per span to a rotating trace file
+
+    The trace lives in cache_dir/trace.jsonl. Once it grows past
+    MAX_BYTES it is moved to trace.1.jsonl, replacing the previous one,
+    so at most twice MAX_BYTES is kept.
+    """
+
+    MAX_BYTES = 2 * 1024 * 1024
+
+    def __init__(self, cache_dir: Path, enabled: bool = True):
+        self.trace_file = Path(cache_dir) / "trace.jsonl"
+        self.backup_file = Path(cache_dir) / "trace.1.jsonl"
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, op: str, url: str = "") -> Iterator[TraceSpan]:
+        """
+        Time an operation and write its record when it ends
+
+        Args:
+            op: Operation name, e.g. "extract" or "resolve"
+            url: URL the operation is for, recorded as its kind only
+        """
+        span = TraceSpan(op, url)
+        try:
+            yield span
+        except Exception as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.wall = span.since_start()
+            self.write(span)
+
+    def write(self, span: TraceSpan):
+        if not self.enabled:
+            return
+
+        line = json.dumps(span.to_dict()) + "\n"
+        with self._lock:
+            try:
+                with open(self.trace_file, "a", encoding="utf-8") as f:
+                    f.write(line)
+                    size = f.tell()
+                if size > self.MAX_BYTES:
+                    os.replace(self.trace_file, self.backup_file)
+            except OSError:
+                pass
+
+    def records(self) -> List[Dict]:
+        """Read all kept records, oldest first"""
+        records = []
+        for path in (self.backup_file, self.trace_file):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            continue
+            except OSError:
+                continue
+        return records
+
+    def summary(self) -> List[Dict]:
+        """
+        Summarize kept records per operation
+
+        Returns:
+            One row per operation and cache outcome with count and
+            p50/p95 of wall time, time to first byte and parse time
+        """
+        groups: Dict[tuple, List[Dict]] = {}
+        for record in self.records():
+            groups.setdefault((record.get("op"), record.get("cache")), []).append(record)
+
+        rows = []
+        for (op, cache), records in sorted(groups.items(), key=lambda item: (str(item[0][0]), str(item[0][1]))):
+            row = {"op": op, "cache": cache, "count": len(records)}
+            for field in ("wall", "ttfb", "parse_time"):
+                values = sorted(r[field] for r in records if r.get(field) is not None)
+                row[f"{field}_p50"] = _percentile(values, 50)
+                row[f"{field}_p95"] = _percentile(values, 95)
+            row["failures"] = sum(1 for r in records if r.get("exit_code") not in (None, 0) or r.get("error"))
+            rows.append(row)
+        return rows
+
+    def clear(self):
+        with self._lock:
+            for path in (self.trace_file, self.backup_file):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+
+def _percentile(values: List[float], percent: int) -> Optional[float]:
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return None
+    rank = max(0, -(-len(values) * percent // 100) - 1)
+    return values[min(rank, len(values) - 1)]
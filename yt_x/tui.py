@@ -2,13 +2,26 @@
 Main TUI application for yt-x
 """
 
+from textual import work
 from textual.app import App, ComposeResult
 from textual.screen import Screen
 from textual.binding import Binding
+from textual.containers import Vertical
 from textual.reactive import reactive
+from textual.widgets import Button, DataTable, Footer, Header, Input, Static
+from textual.worker import get_current_worker
+import subprocess
+import threading
+import time
 import webbrowser
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
+
+from rich.markup import escape
+from rich.text import Text
+
+from .cache import normalize_query
+from .entry import VideoEntry
 
 if TYPE_CHECKING:
     from .app import YTXApp
@@ -64,6 +77,7 @@ class MainScreen(Screen):
                 yield Button("Saved Videos", id="saved")
                 yield Button("Watch History", id="history")
                 yield Button("Clips", id="clips")
+                yield Button("Downloads", id="downloads")
                 yield Button("Edit Config", id="config")
                 yield Button("Miscellaneous", id="misc")
                 yield Button("Exit", id="exit", variant="error")
@@ -84,6 +98,7 @@ class MainScreen(Screen):
             "saved": self.open_saved,
             "history": self.open_history,
             "clips": self.open_clips,
+            "downloads": self.open_downloads,
             "config": self.open_config,
             "misc": self.open_misc,
             "exit": self.exit_app,
@@ -108,7 +123,7 @@ class MainScreen(Screen):
         self.app_ref.open_search_screen("Watch Later", "https://www.youtube.com/playlist?list=WL")
 
     def open_subscriptions(self):
-        self.app_ref.open_search_screen("Subscription Feed", "https://www.youtube.com/feed/subscriptions")
+        self.app_ref.open_subscription_feed()
 
     def open_channels(self):
         self.app_ref.push_screen(ChannelsScreen(self.app_ref))
@@ -128,6 +143,9 @@ class MainScreen(Screen):
     def open_clips(self):
         self.app_ref.open_search_screen("Clips", "https://www.youtube.com/feed/clips")
 
+    def open_downloads(self):
+        self.app_ref.push_screen(DownloadsScreen(self.app_ref))
+
     def open_config(self):
         self.app_ref.push_screen(ConfigScreen(self.app_ref))
 
@@ -148,80 +166,293 @@ class VideoListScreen(Screen):
         Binding("escape", "pop_screen", "Back"),
     ]
 
-    def __init__(self, app, title: str, url: str):
+    CSS = """
+    #preview {
+        height: 14;
+    }
+    """
+
+    # Rows are added in batches so the event loop is never blocked for long
+    BATCH_SIZE = 50
+    BATCH_INTERVAL = 0.1
+    # Only this many rows above and below the viewport are in the table;
+    # the window is moved when the cursor comes within half of it
+    WINDOW_MARGIN = 50
+    # Fetch the next page once the cursor is this close to the last loaded video
+    FETCH_AHEAD = 50
+
+    def __init__(self, app, title: str, url: str, source=None):
         super().__init__()
         self.app_ref = app
         self.title = title
         self.url = url
+        # Optional callable(refresh) yielding videos instead of fetching the URL
+        self.source = source
         self.videos = []
         self.selected_video = None
+        self._dwell_timer = None
+        self.preview = bool(app.config.get("ENABLE_PREVIEW", False))
+        # Index in self.videos of the table's first row
+        self._offset = 0
+        # Videos to load before the fetch waits for the cursor to get closer
+        self._wanted = 0
+        self._more = threading.Event()
+        # Bumped on every load so batches from a superseded fetch are dropped
+        self._generation = 0
 
     def compose(self):
         yield Header()
         with Vertical():
             yield Static(f"[bold cyan]{self.title}[/bold cyan]", id="screen-title")
-            yield DataTable(id="video-table")
+            yield Static("", id="list-status")
+            yield DataTable(id="video-table", cursor_type="row")
+            if self.preview:
+                yield Static("", id="preview")
         yield Footer()
 
     def on_mount(self) -> None:
-        self.load_videos()
-
-    def load_videos(self):
         table = self.query_one("#video-table", DataTable)
-        table.clear()
         table.add_column("Title")
         table.add_column("Channel")
         table.add_column("Duration")
         table.add_column("Views")
+        if self.preview:
+            self.watch(table, "scroll_y", self._update_visible_thumbnails, init=False)
+        self.load_videos()
 
-        self.videos = self.app_ref.fetch_videos(self.url)
+    def on_unmount(self) -> None:
+        # Stop any fetch still running for this screen
+        self.workers.cancel_node(self)
+        self.app_ref.player.cancel_prefetch()
 
-        for video in self.videos:
-            title = video.get("title", "Unknown")[:60]
-            channel = video.get("channel", "Unknown")[:25]
-            duration = self._format_duration(video.get("duration", 0))
-            views = self._format_views(video.get("view_count", 0))
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        # Moving the window queues highlights for rows that no longer exist
+        if event.cursor_row != event.data_table.cursor_row:
+            return
 
-            table.add_row(
-                title,
-                channel,
-                duration,
-                views
-            )
+        index = self._offset + event.cursor_row
+        self._check_window(index)
 
-    def _format_duration(self, duration: int) -> str:
-        """Format duration in human readable format"""
-        hours = duration // 3600
-        minutes = (duration % 3600) // 60
-        seconds = duration % 60
+        if index >= len(self.videos) - self.FETCH_AHEAD:
+            self._request_more()
 
-        if hours > 0:
-            return f"{hours}h {minutes}m"
-        elif minutes > 0:
-            return f"{minutes}m {seconds}s"
-        else:
-            return f"{seconds}s"
-
-    def _format_views(self, views: int) -> str:
-        """Format view count"""
-        if views >= 1000000:
-            return f"{views / 1000000:.1f}M"
-        elif views >= 1000:
-            return f"{views / 1000:.1f}K"
+        # Restart the dwell timer; only resolve once the cursor settles
+        self.app_ref.player.cancel_prefetch()
+        if self._dwell_timer:
+            self._dwell_timer.stop()
+        dwell = float(self.app_ref.config.get("PREFETCH_DWELL", 0.4))
+        self._dwell_timer = self.set_timer(dwell, self._prefetch_highlighted)
+        if self.preview:
+            self._show_preview(index)
+
+    def _current_index(self) -> int:
+        """Get the position in self.videos of the highlighted row"""
+        return self._offset + self.query_one("#video-table", DataTable).cursor_row
+
+    def _window_size(self) -> int:
+        table = self.query_one("#video-table", DataTable)
+        return max(table.scrollable_content_region.height, 20) + 2 * self.WINDOW_MARGIN
+
+    def _check_window(self, index: int):
+        """Move the window if the cursor is getting close to one of its ends"""
+        row_count = self.query_one("#video-table", DataTable).row_count
+        near_top = self._offset > 0 and index - self._offset < self.WINDOW_MARGIN // 2
+        near_bottom = (
+            self._offset + row_count < len(self.videos)
+            and self._offset + row_count - index < self.WINDOW_MARGIN // 2
+        )
+        if near_top or near_bottom:
+            self._render_window(index)
+
+    def _render_window(self, index: int):
+        """Fill the table with the rows around a video, keeping it highlighted"""
+        table = self.query_one("#video-table", DataTable)
+        self._offset = max(0, index - self.WINDOW_MARGIN)
+        table.clear()
+        table.add_rows(
+            self._row_cells(video)
+            for video in self.videos[self._offset:self._offset + self._window_size()]
+        )
+        table.move_cursor(row=index - self._offset)
+
+    def _request_more(self):
+        """Let the fetch start on the next page"""
+        page_size = int(self.app_ref.config.get("LIST_PAGE_SIZE", 200))
+        if self._wanted < len(self.videos) + page_size:
+            self._wanted = len(self.videos) + page_size
+            self._more.set()
+
+    def _prefetch_highlighted(self):
+        """Pre-resolve the highlighted video and the next few"""
+        self._dwell_timer = None
+        index = self._current_index()
+        ahead = int(self.app_ref.config.get("PREFETCH_AHEAD", 2))
+        urls = [video.url for video in self.videos[index:index + ahead + 1]]
+        self.app_ref.player.prefetch(urls)
+
+    def load_videos(self, refresh: bool = False):
+        table = self.query_one("#video-table", DataTable)
+        table.clear()
+        self.videos = []
+        self._offset = 0
+        self._wanted = int(self.app_ref.config.get("LIST_PAGE_SIZE", 200))
+        self._more.clear()
+        self._generation += 1
+        self.query_one("#list-status", Static).update("[dim]Loading...[/dim]")
+        self._fetch_videos(refresh, self._generation)
+
+    @work(thread=True, exclusive=True, group="load")
+    def _fetch_videos(self, refresh: bool, generation: int):
+        """Fetch videos in a worker thread and add them in batches
+
+        Videos are fetched LIST_PAGE_SIZE at a time. Once a page past the
+        cursor is loaded, the next one is only started when the cursor
+        gets closer to the end, so long lists are fetched on demand.
+        """
+        worker = get_current_worker()
+        page_size = int(self.app_ref.config.get("LIST_PAGE_SIZE", 200))
+        batch = []
+        loaded = 0
+        last_flush = time.monotonic()
+
+        if self.source:
+            videos = self.source(refresh)
         else:
-            return str(views)
+            videos = self.app_ref.iter_videos(self.url, refresh=refresh, page_size=page_size)
+
+        for video in videos:
+            if worker.is_cancelled:
+                return
+            batch.append(video)
+            loaded += 1
+            if len(batch) >= self.BATCH_SIZE or time.monotonic() - last_flush >= self.BATCH_INTERVAL:
+                self.app.call_from_thread(self._add_videos, batch, generation)
+                batch = []
+                last_flush = time.monotonic()
+
+            # Pages end between yt-dlp runs, so waiting there leaves none blocked
+            if loaded % page_size == 0 and loaded >= self._wanted:
+                if batch:
+                    self.app.call_from_thread(self._add_videos, batch, generation)
+                    batch = []
+                self.app.call_from_thread(self._set_status, f"{loaded} videos, more on demand", generation)
+                while loaded >= self._wanted and not worker.is_cancelled:
+                    self._more.wait(0.2)
+                    self._more.clear()
+                # Leaving the screen must not start the next page
+                if worker.is_cancelled:
+                    return
+                last_flush = time.monotonic()
+
+        if worker.is_cancelled:
+            return
+        if batch:
+            self.app.call_from_thread(self._add_videos, batch, generation)
+        self.app.call_from_thread(self._finish_loading, generation)
+
+    def _row_cells(self, video: VideoEntry) -> tuple:
+        title = (video.title or "Unknown")[:60]
+        channel = (video.channel or "Unknown")[:25]
+        return (title, channel, video.duration_text, video.views_text)
+
+    def _add_videos(self, videos: list, generation: int):
+        """Add a batch of videos, creating rows only while the window has room"""
+        if generation != self._generation:
+            return
 
-    def action_select_video(self):
         table = self.query_one("#video-table", DataTable)
-        row_key, _ = table.cursor_cell
+        start = self._offset + table.row_count
+        self.videos.extend(videos)
+        end = min(len(self.videos), self._offset + self._window_size())
+        table.add_rows(self._row_cells(video) for video in self.videos[start:end])
+
+        self._set_status(f"Loading... {len(self.videos)} videos")
+        if self.preview:
+            self._update_visible_thumbnails()
+
+    def _set_status(self, text: str, generation: Optional[int] = None):
+        if generation is not None and generation != self._generation:
+            return
+        self.query_one("#list-status", Static).update(f"[dim]{text}[/dim]")
+
+    def _update_visible_thumbnails(self, *_):
+        """Fetch thumbnails for the rows on screen before any others"""
+        table = self.query_one("#video-table", DataTable)
+        first = self._offset + int(table.scroll_y)
+        last = first + table.scrollable_content_region.height + 1
+        self.app_ref.thumbnails.set_visible(
+            video.thumbnail for video in self.videos[first:last]
+        )
+
+    def _show_preview(self, index: int):
+        """Show the thumbnail of a video, once it has been fetched"""
+        if not 0 <= index < len(self.videos):
+            return
+
+        url = self.videos[index].thumbnail
+        if not url:
+            self.query_one("#preview", Static).update("")
+            return
+
+        def ready(_url, path):
+            self.app.call_from_thread(self._thumbnail_ready, index, path)
+
+        path = self.app_ref.thumbnails.get(url, callback=ready)
+        if path:
+            self._render_preview(path)
+
+    def _thumbnail_ready(self, index: int, path: Path):
+        """Render a fetched thumbnail if its video is still highlighted"""
+        if self.is_mounted and self._current_index() == index:
+            self._render_preview(path)
+
+    @work(thread=True, exclusive=True, group="preview")
+    def _render_preview(self, path: Path):
+        """Render a thumbnail with the configured image renderer"""
+        from .executables import get_executable_cache
+
+        renderer = self.app_ref.config.get("IMAGE_RENDERER", "chafa")
+        renderer_cmd = get_executable_cache(self.app_ref.config.cache_dir).find([renderer, f"{renderer}.exe"])
+        if not renderer_cmd:
+            self.app.call_from_thread(self._set_preview, Text(str(path)))
+            return
+
+        preview = self.query_one("#preview", Static)
+        size = f"{max(preview.size.width, 20)}x{max(preview.size.height, 10)}"
+        try:
+            result = subprocess.run(
+                [renderer_cmd, "--size", size, str(path)],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return
+
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(self._set_preview, Text.from_ansi(result.stdout))
+
+    def _set_preview(self, content: Text):
+        if self.is_mounted:
+            self.query_one("#preview", Static).update(content)
 
-        if row_key is not None and row_key in self.videos:
-            video = self.videos[row_key]
+    def _finish_loading(self, generation: int):
+        """Update status once all videos are loaded"""
+        if generation != self._generation:
+            return
+        status = f"{len(self.videos)} videos" if self.videos else "No videos found"
+        self.query_one("#list-status", Static).update(f"[dim]{status}[/dim]")
+
+    def action_select_video(self):
+        index = self._current_index()
+
+        if 0 <= index < len(self.videos):
+            video = self.videos[index]
             self.selected_video = video
             self.app.open_video_actions(video)
 
     def action_refresh(self):
-        self.load_videos()
+        self.load_videos(refresh=True)
 
 
 class SearchScreen(Screen):
@@ -230,35 +461,181 @@ class SearchScreen(Screen):
     BINDINGS = [
         Binding("escape", "pop_screen", "Cancel"),
         Binding("enter", "do_search", "Search"),
+        Binding("ctrl+l", "toggle_local", "Local"),
+        Binding("ctrl+t", "toggle_live", "Live"),
+        Binding("down", "focus_results", "Results", show=False),
     ]
 
+    LOCAL_RESULTS = 50
+    # Live searches wait for at least this many characters
+    LIVE_MIN_LENGTH = 3
+    MAX_SUGGESTIONS = 5
+
     def __init__(self, app):
         super().__init__()
         self.app_ref = app
+        # Searches the local index as you type instead of YouTube
+        self.local = False
+        # Searches YouTube as you type, once typing pauses
+        self.live = bool(app.config.get("LIVE_SEARCH", False))
+        self.results = []
+        self._history = app.config.get_search_history()
+        self._debounce_timer = None
+        self._live_cancel = None
 
     def compose(self):
         yield Header()
         with Vertical():
-            yield Static("[bold cyan]Search YouTube[/bold cyan]")
+            yield Static("", id="search-title")
             yield Input(placeholder="Enter search query...", id="search-input")
-            yield Static("Press Enter to search, Escape to cancel", id="help-text")
+            yield Static("", id="suggestions")
+            yield Static(
+                "Press Enter to search, Ctrl+T for live search, Ctrl+L to search offline, Escape to cancel",
+                id="help-text"
+            )
+            yield DataTable(id="results-table", cursor_type="row")
         yield Footer()
 
     def on_mount(self) -> None:
+        table = self.query_one("#results-table", DataTable)
+        table.add_column("Title")
+        table.add_column("Channel")
+        self._update_mode()
         input_box = self.query_one("#search-input", Input)
         input_box.focus()
 
+    def on_unmount(self) -> None:
+        self._cancel_live()
+        self.workers.cancel_node(self)
+
+    def _update_mode(self):
+        """Show the title and results table for the current mode"""
+        if self.local:
+            title = "Search Offline"
+        elif self.live:
+            title = "Search YouTube (live)"
+        else:
+            title = "Search YouTube"
+        self.query_one("#search-title", Static).update(f"[bold cyan]{title}[/bold cyan]")
+        self.query_one("#results-table", DataTable).display = self.local or self.live
+        self._show_results([])
+
+    def action_toggle_local(self):
+        self.local = not self.local
+        if self.local and not self.app_ref.config.index:
+            self.local = False
+            self.notify("The local index is disabled (LOCAL_INDEX)")
+            return
+
+        self._cancel_live()
+        self._update_mode()
+        if self.local:
+            self._search_local(self.query_one("#search-input", Input).value)
+
+    def action_toggle_live(self):
+        self.live = not self.live
+        self.local = False
+        self._cancel_live()
+        self._update_mode()
+        if self.live:
+            self._schedule_live(self.query_one("#search-input", Input).value)
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        self._show_suggestions(event.value)
+        if self.local:
+            self._search_local(event.value)
+        elif self.live:
+            self._schedule_live(event.value)
+
+    def _show_suggestions(self, text: str):
+        """Show earlier searches starting with what has been typed"""
+        prefix = normalize_query(text)
+        matches = []
+        if prefix:
+            matches = [
+                query for query in self._history
+                if normalize_query(query).startswith(prefix) and normalize_query(query) != prefix
+            ][:self.MAX_SUGGESTIONS]
+        self.query_one("#suggestions", Static).update(
+            "[dim]" + "  |  ".join(escape(query) for query in matches) + "[/dim]" if matches else ""
+        )
+
+    def _search_local(self, query: str):
+        """Show matches from the local index"""
+        self._show_results(self.app_ref.config.index.search(query, limit=self.LOCAL_RESULTS))
+
+    def _show_results(self, results: list):
+        self.results = [VideoEntry.from_dict(video) for video in results]
+        table = self.query_one("#results-table", DataTable)
+        table.clear()
+        table.add_rows(
+            ((video.title or "Unknown")[:60], (video.channel or "")[:25])
+            for video in self.results
+        )
+
+    def _cancel_live(self):
+        """Stop the pending live search and kill its yt-dlp process"""
+        if self._debounce_timer:
+            self._debounce_timer.stop()
+            self._debounce_timer = None
+        if self._live_cancel:
+            self._live_cancel.set()
+            self._live_cancel = None
+
+    def _schedule_live(self, text: str):
+        """Restart the debounce timer for a live search"""
+        self._cancel_live()
+        query = text.strip()
+        if len(query) < self.LIVE_MIN_LENGTH:
+            return
+
+        # Queries answered by the result cache are shown without waiting
+        cached = self.app_ref.ytdlp.search_cache.get(query)
+        if cached is not None:
+            self._show_results(cached)
+            return
+
+        debounce = float(self.app_ref.config.get("SEARCH_DEBOUNCE", 0.4))
+        self._debounce_timer = self.set_timer(debounce, lambda: self._start_live(query))
+
+    def _start_live(self, query: str):
+        self._debounce_timer = None
+        self._live_cancel = threading.Event()
+        self._live_search(query, self._live_cancel)
+
+    @work(thread=True, exclusive=True, group="live-search")
+    def _live_search(self, query: str, cancel: threading.Event):
+        """Search YouTube in a worker thread"""
+        results = self.app_ref.ytdlp.search(query, cancel=cancel)
+        if results is not None and not cancel.is_set():
+            self.app.call_from_thread(self._live_results, query, results, cancel)
+
+    def _live_results(self, query: str, results: list, cancel: threading.Event):
+        # Drop results for a query that has been superseded meanwhile
+        if cancel is self._live_cancel:
+            self._live_cancel = None
+            self._show_results(results)
+
+    def action_focus_results(self):
+        if (self.local or self.live) and self.results:
+            self.query_one("#results-table", DataTable).focus()
+
+    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
+        if 0 <= event.cursor_row < len(self.results):
+            self.app_ref.open_video_actions(self.results[event.cursor_row])
+
     def action_do_search(self):
         input_box = self.query_one("#search-input", Input)
         query = input_box.value.strip()
 
-        if query:
+        if self.local:
+            if self.results:
+                self.app_ref.open_video_actions(self.results[0])
+        elif query:
+            self._cancel_live()
             self.app_ref.config.add_search_history(query)
-            # Encode query for URL
-            import urllib.parse
-            encoded_query = urllib.parse.quote(query)
-            search_url = f"https://www.youtube.com/results?search_query={encoded_query}"
-            self.app_ref.open_search_screen(f"Search: {query}", search_url)
+            self._history = self.app_ref.config.get_search_history()
+            self.app_ref.open_search_results(query)
         else:
             self.pop_screen()
 
@@ -295,8 +672,8 @@ class SavedVideosScreen(Screen):
         saved = self.app_ref.config.get_saved_videos()
 
         for video in saved:
-            title = video.get("title", "Unknown")[:60]
-            channel = video.get("channel", "Unknown")[:25]
+            title = (video.title or "Unknown")[:60]
+            channel = (video.channel or "Unknown")[:25]
             table.add_row(title, channel)
 
     def action_delete_video(self):
@@ -306,7 +683,7 @@ class SavedVideosScreen(Screen):
         if row_key is not None:
             saved = self.app_ref.config.get_saved_videos()
             if row_key < len(saved):
-                video_id = saved[row_key].get("id")
+                video_id = saved[row_key].id or saved[row_key].url
                 self.app_ref.config.remove_saved_video(video_id)
                 self.load_saved_videos()
 
@@ -365,15 +742,19 @@ class ChannelsScreen(Screen):
         yield Header()
         with Vertical():
             yield Static("[bold cyan]Channels[/bold cyan]")
+            yield Static("", id="sync-status")
             yield DataTable(id="channel-table")
         yield Footer()
 
     def on_mount(self) -> None:
         self.load_channels()
 
+    def on_unmount(self) -> None:
+        self.workers.cancel_node(self)
+
     def load_channels(self):
         table = self.query_one("#channel-table", DataTable)
-        table.clear()
+        table.clear(columns=True)
         table.add_column("Channel")
         table.add_column("Subscribers")
 
@@ -385,8 +766,28 @@ class ChannelsScreen(Screen):
             table.add_row(name, str(subs_count))
 
     def action_sync_subscriptions(self):
-        # Sync subscriptions from YouTube
-        pass
+        self.query_one("#sync-status", Static).update("[dim]Syncing...[/dim]")
+        self._sync()
+
+    @work(thread=True, exclusive=True, group="sync")
+    def _sync(self):
+        """Sync the subscription feed in a worker thread"""
+        worker = get_current_worker()
+        cancel = threading.Event()
+
+        def progress(done: int, total: int):
+            if worker.is_cancelled:
+                cancel.set()
+                return
+            self.app.call_from_thread(self._set_status, f"Syncing... {done}/{total} channels")
+
+        added = self.app_ref.subscription_sync.sync(progress=progress, cancel=cancel)
+
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self._set_status, f"Sync complete, {added} new videos")
+
+    def _set_status(self, text: str):
+        self.query_one("#sync-status", Static).update(f"[dim]{text}[/dim]")
 
 
 class ConfigScreen(Screen):
@@ -425,6 +826,7 @@ class MiscScreen(Screen):
             yield Button("Explore Playlists", id="explore-playlists")
             yield Button("Search History", id="search-history")
             yield Button("Clear Search History", id="clear-history")
+            yield Button("yt-dlp Timings", id="trace-summary")
             yield Button("Back", id="back")
         yield Footer()
 
@@ -440,14 +842,187 @@ class MiscScreen(Screen):
             pass
         elif button_id == "clear-history":
             self.app_ref.config.clear_search_history()
+        elif button_id == "trace-summary":
+            self.app.push_screen(TraceSummaryScreen(self.app_ref))
         elif button_id == "back":
             self.pop_screen()
 
 
+class TraceSummaryScreen(Screen):
+    """Screen summarizing traced yt-dlp calls"""
+
+    BINDINGS = [
+        Binding("q", "pop_screen", "Back"),
+        Binding("r", "reload", "Reload"),
+        Binding("c", "clear", "Clear"),
+        Binding("escape", "pop_screen", "Back"),
+    ]
+
+    def __init__(self, app):
+        super().__init__()
+        self.app_ref = app
+
+    def compose(self):
+        yield Header()
+        with Vertical():
+            yield Static("[bold cyan]yt-dlp Timings[/bold cyan]")
+            yield Static("", id="trace-status")
+            yield DataTable(id="trace-table", cursor_type="row")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        table = self.query_one("#trace-table", DataTable)
+        for column in ("Operation", "Cache", "Calls", "Failed", "Wall p50", "Wall p95",
+                       "TTFB p50", "TTFB p95", "Parse p50", "Parse p95"):
+            table.add_column(column)
+        self.action_reload()
+
+    def action_reload(self):
+        self._load()
+
+    def action_clear(self):
+        self.app_ref.ytdlp.tracer.clear()
+        self._load()
+
+    @work(thread=True, exclusive=True, group="trace")
+    def _load(self):
+        """Read the trace file in a worker thread"""
+        tracer = self.app_ref.ytdlp.tracer
+        rows = tracer.summary()
+        status = f"From {tracer.trace_file}" if tracer.enabled else "Tracing is off (TRACE_YTDLP)"
+        shared = ", ".join(
+            f"{op} {counts['shared']} of {counts['calls']}"
+            for op, counts in sorted(self.app_ref.ytdlp.inflight.counters().items())
+        )
+        if shared:
+            status += f"\nShared with an identical call in flight this session: {shared}"
+        self.app.call_from_thread(self._show, rows, status)
+
+    def _show(self, rows: list, status: str):
+        self.query_one("#trace-status", Static).update(f"[dim]{status}[/dim]")
+        table = self.query_one("#trace-table", DataTable)
+        table.clear()
+        for row in rows:
+            table.add_row(
+                row["op"],
+                row["cache"] or "",
+                str(row["count"]),
+                str(row["failures"]),
+                *(self._format_ms(row[f"{field}_{p}"])
+                  for field in ("wall", "ttfb", "parse_time") for p in ("p50", "p95"))
+            )
+
+    def _format_ms(self, seconds) -> str:
+        if seconds is None:
+            return ""
+        return f"{seconds * 1000:.0f} ms"
+
+
+class DownloadsScreen(Screen):
+    """Screen showing the download queue"""
+
+    BINDINGS = [
+        Binding("q", "pop_screen", "Back"),
+        Binding("p", "pause", "Pause"),
+        Binding("r", "resume", "Resume"),
+        Binding("t", "retry", "Retry"),
+        Binding("d", "remove", "Remove"),
+        Binding("escape", "pop_screen", "Back"),
+    ]
+
+    # Seconds between table refreshes; jobs never push updates themselves
+    REFRESH_INTERVAL = 0.5
+
+    def __init__(self, app):
+        super().__init__()
+        self.app_ref = app
+
+    def compose(self):
+        yield Header()
+        with Vertical():
+            yield Static("[bold cyan]Downloads[/bold cyan]")
+            yield DataTable(id="download-table", cursor_type="row")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        table = self.query_one("#download-table", DataTable)
+        table.add_column("Title", key="title")
+        table.add_column("Status", key="status")
+        table.add_column("Progress", key="progress")
+        table.add_column("Speed", key="speed")
+        table.add_column("ETA", key="eta")
+        self.refresh_jobs()
+        self.set_interval(self.REFRESH_INTERVAL, self.refresh_jobs)
+
+    def refresh_jobs(self):
+        """Sync the table with the queue, updating only changed cells"""
+        table = self.query_one("#download-table", DataTable)
+        jobs = self.app_ref.downloads.jobs()
+        job_ids = {job["id"] for job in jobs}
+
+        for row_key in list(table.rows):
+            if row_key.value not in job_ids:
+                table.remove_row(row_key)
+
+        for job in jobs:
+            cells = {
+                "title": (job.get("title") or "")[:50],
+                "status": job["status"],
+                "progress": f"{job.get('progress') or 0:.1f}%",
+                "speed": self._format_speed(job.get("speed")),
+                "eta": f"{int(job['eta'])}s" if job.get("eta") is not None else "",
+            }
+            if job["id"] not in table.rows:
+                table.add_row(*cells.values(), key=job["id"])
+                continue
+            for column, value in cells.items():
+                if table.get_cell(job["id"], column) != value:
+                    table.update_cell(job["id"], column, value)
+
+    def _format_speed(self, speed) -> str:
+        """Format download speed"""
+        if not speed:
+            return ""
+        if speed >= 1024 * 1024:
+            return f"{speed / 1024 / 1024:.1f} MiB/s"
+        return f"{speed / 1024:.0f} KiB/s"
+
+    def _selected_job(self) -> str:
+        table = self.query_one("#download-table", DataTable)
+        if not table.row_count:
+            return None
+        row_key, _ = table.coordinate_to_cell_key(table.cursor_coordinate)
+        return row_key.value
+
+    def action_pause(self):
+        job_id = self._selected_job()
+        if job_id:
+            self.app_ref.downloads.pause(job_id)
+            self.refresh_jobs()
+
+    def action_resume(self):
+        job_id = self._selected_job()
+        if job_id:
+            self.app_ref.downloads.resume(job_id)
+            self.refresh_jobs()
+
+    def action_retry(self):
+        job_id = self._selected_job()
+        if job_id:
+            self.app_ref.downloads.retry(job_id)
+            self.refresh_jobs()
+
+    def action_remove(self):
+        job_id = self._selected_job()
+        if job_id:
+            self.app_ref.downloads.remove(job_id)
+            self.refresh_jobs()
+
+
 class VideoActionsScreen(Screen):
     """Screen with actions for a selected video"""
 
-    def __init__(self, app, video: dict):
+    def __init__(self, app, video: VideoEntry):
         super().__init__()
         self.app_ref = app
         self.video = video
@@ -456,8 +1031,8 @@ class VideoActionsScreen(Screen):
         yield Header()
         with Vertical(id="video-actions"):
             yield Static("[bold cyan]Video Actions[/bold cyan]")
-            yield Static(f"[bold]Title:[/bold] {self.video.get('title', 'Unknown')}")
-            yield Static(f"[bold]Channel:[/bold] {self.video.get('channel', 'Unknown')}")
+            yield Static(f"[bold]Title:[/bold] {self.video.title or 'Unknown'}")
+            yield Static(f"[bold]Channel:[/bold] {self.video.channel or 'Unknown'}")
             yield Static("")
             yield Button("Watch", id="watch")
             yield Button("Listen (Audio Only)", id="listen")
@@ -470,7 +1045,7 @@ class VideoActionsScreen(Screen):
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         button_id = event.button.id
-        video_url = self.video.get("url", "")
+        video_url = self.video.url or ""
 
         if button_id == "watch":
             self.app_ref.player.play_video(video_url)
@@ -489,11 +1064,13 @@ class VideoActionsScreen(Screen):
             output_template = str(
                 Path(self.app_ref.config.get("DOWNLOAD_DIRECTORY")) / "videos" / "%(channel)s" / "%(title)s.%(ext)s"
             )
-            self.app_ref.ytdlp.download(video_url, output_template)
+            self.app_ref.downloads.add(video_url, output_template, title=self.video.title)
+            self.notify("Added to download queue")
         elif button_id == "download-audio":
             output_template = str(
                 Path(self.app_ref.config.get("DOWNLOAD_DIRECTORY")) / "audio" / "%(channel)s" / "%(title)s.%(ext)s"
             )
-            self.app_ref.ytdlp.download(video_url, output_template, audio_only=True)
+            self.app_ref.downloads.add(video_url, output_template, audio_only=True, title=self.video.title)
+            self.notify("Added to download queue")
         elif button_id == "back":
             self.pop_screen()
@@ -4,50 +4,127 @@ yt-dlp wrapper for fetching YouTube data
 
 import json
 import subprocess
+import tempfile
+import threading
+import time
+import urllib.parse
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Any, Callable, Optional, Dict, Iterator, List
+
+from .cache import (
+    SearchResultCache,
+    SingleFlight,
+    StreamURLCache,
+    classify_url,
+    normalize_query,
+    video_id_from_url,
+)
+from .ingest import loads, parse_info, slim_entry, slim_info
+from .tracing import Tracer, TraceSpan
+
+
+class _StdoutReader:
+    """Reads yt-dlp's stdout in chunks as they arrive
+
+    Notes time to first byte on the span, and counts bytes read and the
+    time spent waiting on yt-dlp so parsing can be timed on its own.
+    """
+
+    def __init__(self, stream, span: Optional[TraceSpan]):
+        self.stream = stream
+        self.span = span
+        self.size = 0
+        self.wait_time = 0.0
+
+    def read(self, size: int = 65536) -> bytes:
+        started = time.perf_counter()
+        chunk = self.stream.read1(size)
+        self.wait_time += time.perf_counter() - started
+        if chunk and not self.size and self.span:
+            self.span.ttfb = self.span.since_start()
+        self.size += len(chunk)
+        return chunk
 
 
 class YTDLP:
     """Wrapper for yt-dlp command"""
 
+    # Streamed entries are indexed in batches of this many
+    INDEX_BATCH = 100
+    # Seconds between checks of a cancel event while yt-dlp runs
+    CANCEL_POLL = 0.1
+
     def __init__(self, config):
         self.config = config
         self.yt_dlp_cmd = self._find_yt_dlp()
+        self.engine = self._load_engine()
+        self.cache = self._load_cache()
+        self.stream_cache = StreamURLCache()
+        self.search_cache = SearchResultCache()
+        # Identical fetches and resolutions running at once share one yt-dlp
+        self.inflight = SingleFlight()
+        self.tracer = Tracer(config.cache_dir, enabled=bool(config.get("TRACE_YTDLP", True)))
+
+    def _load_cache(self):
+        """Load the metadata cache if enabled"""
+        if not self.config.get("METADATA_CACHE", True):
+            return None
+
+        from .cache import MetadataCache
+        max_size = int(self.config.get("METADATA_CACHE_SIZE_MB", 100)) * 1024 * 1024
+        return MetadataCache(self.config.cache_dir, max_size)
+
+    def _load_engine(self):
+        """Load the in-process or helper engine if configured"""
+        engine = self.config.get("YTDLP_ENGINE", "subprocess")
+
+        if engine == "helper":
+            from .helper import HelperEngine
+            if HelperEngine.is_available():
+                return HelperEngine(
+                    timeout=float(self.config.get("HELPER_TIMEOUT", 120)),
+                    workers=int(self.config.get("HELPER_WORKERS", 4))
+                )
+            print("yt_dlp Python package not found, falling back to the yt-dlp executable")
+            return None
+
+        if engine != "inprocess":
+            return None
+
+        try:
+            from .engine import InProcessEngine
+            return InProcessEngine()
+        except ImportError:
+            print("yt_dlp Python package not found, falling back to the yt-dlp executable")
+            return None
 
     def _find_yt_dlp(self) -> str:
         """Find yt-dlp executable"""
-        # Check common locations
-        for cmd in ["yt-dlp", "yt-dlp.exe", "yt-dlp.bat"]:
-            try:
-                result = subprocess.run(
-                    ["where", cmd],
-                    capture_output=True,
-                    text=True,
-                    shell=True
-                )
-                if result.returncode == 0:
-                    return cmd
-            except:
-                pass
+        from .executables import get_executable_cache
 
-        # Try to run directly
-        for cmd in ["yt-dlp", "yt-dlp.exe"]:
-            try:
-                subprocess.run(
-                    [cmd, "--version"],
-                    capture_output=True,
-                    check=False,
-                    shell=True
-                )
-                return cmd
-            except:
-                pass
+        path = get_executable_cache(self.config.cache_dir).find(["yt-dlp", "yt-dlp.exe", "yt-dlp.bat"])
+        if path:
+            return path
 
         raise RuntimeError(
             "yt-dlp not found. Please install it from https://github.com/yt-dlp/yt-dlp"
         )
 
+    def get_info(self) -> Dict:
+        """
+        Get yt-dlp version and capabilities
+
+        Returns:
+            Dictionary with "version" and "capabilities" keys
+        """
+        from .executables import get_executable_cache
+
+        return get_executable_cache(self.config.cache_dir).get_info(self.yt_dlp_cmd)
+
+    def has_capability(self, name: str) -> bool:
+        """Check if the installed yt-dlp supports a feature"""
+        return name in self.get_info().get("capabilities", [])
+
     def _get_browser_args(self) -> List[str]:
         """Get browser arguments for yt-dlp"""
         browser = self.config.get("PREFERRED_BROWSER", "")
@@ -55,7 +132,211 @@ class YTDLP:
             return ["--cookies-from-browser", browser]
         return []
 
-    def fetch_json(self, url: str, flat: bool = True, extra_args: Optional[List[str]] = None) -> Optional[Dict]:
+    def _run(
+        self,
+        args: List[str],
+        timeout: Optional[int] = None,
+        cancel: Optional[threading.Event] = None,
+        span: Optional[TraceSpan] = None,
+        parse: Optional[Callable[[_StdoutReader], Any]] = None
+    ) -> subprocess.CompletedProcess:
+        """
+        Run yt-dlp with the given arguments
+
+        Args:
+            args: yt-dlp arguments
+            timeout: Seconds before yt-dlp is killed and TimeoutExpired raised
+            cancel: Kills yt-dlp when set
+            span: Receives time to first byte, output size and exit code
+            parse: Consumes stdout as it arrives; its result becomes the
+                stdout of the returned process instead of the decoded text
+
+        Raises:
+            ValueError: If parse fails and yt-dlp exited successfully
+        """
+        cmd = [self.yt_dlp_cmd] + args
+        expired = threading.Event()
+        parse_error = None
+
+        # stderr goes to a file so a chatty yt-dlp can never block on it
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr)
+
+            if timeout or cancel:
+                threading.Thread(
+                    target=self._watch,
+                    args=(process, timeout, cancel, expired),
+                    daemon=True
+                ).start()
+
+            reader = _StdoutReader(process.stdout, span)
+            try:
+                if parse:
+                    parse_started = time.perf_counter()
+                    try:
+                        stdout = parse(reader)
+                    except ValueError as e:
+                        stdout, parse_error = None, e
+                    if span:
+                        span.parse_time = time.perf_counter() - parse_started - reader.wait_time
+                    # Drain whatever the parser did not need so yt-dlp can exit
+                    while reader.read():
+                        pass
+                else:
+                    stdout = b"".join(iter(reader.read, b"")).decode("utf-8", "replace")
+            finally:
+                process.stdout.close()
+            returncode = process.wait()
+
+            stderr.seek(0)
+            stderr_text = stderr.read().decode("utf-8", "replace")
+
+        if span:
+            span.stdout_bytes = reader.size
+            span.exit_code = returncode
+
+        if expired.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout, None, stderr_text)
+
+        if parse_error and returncode == 0 and not (cancel and cancel.is_set()):
+            raise parse_error
+
+        return subprocess.CompletedProcess(cmd, returncode, stdout, stderr_text)
+
+    def _watch(
+        self,
+        process: subprocess.Popen,
+        timeout: Optional[int],
+        cancel: Optional[threading.Event],
+        expired: threading.Event
+    ):
+        """Kill yt-dlp when `cancel` is set or `timeout` passes"""
+        deadline = time.monotonic() + timeout if timeout else None
+        while process.poll() is None:
+            if cancel:
+                if cancel.wait(self.CANCEL_POLL):
+                    break
+            else:
+                time.sleep(self.CANCEL_POLL)
+            if deadline is not None and time.monotonic() >= deadline:
+                expired.set()
+                break
+
+        if process.poll() is None:
+            process.kill()
+
+    def _extract(
+        self,
+        url: str,
+        args: List[str],
+        error_label: str,
+        cancel: Optional[threading.Event] = None,
+        span: Optional[TraceSpan] = None
+    ) -> Optional[Dict]:
+        """
+        Run a -J extraction with the active backend
+
+        Returns:
+            Extracted data, or None if cancelled
+
+        Raises:
+            RuntimeError: If the extraction fails, with a message for the user
+        """
+        if self.engine:
+            try:
+                data = self.engine.extract(url, args, cancel=cancel)
+            except Exception as e:
+                raise RuntimeError(f"{error_label}: {e}") from e
+            return slim_info(data) if data else data
+
+        try:
+            # Parsed while yt-dlp prints, keeping only the fields yt-x uses
+            result = self._run([url] + args, cancel=cancel, span=span, parse=parse_info)
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Error parsing JSON: {e}") from e
+        except Exception as e:
+            raise RuntimeError(f"Error: {e}") from e
+
+        if cancel and cancel.is_set():
+            return None
+
+        if result.returncode != 0:
+            raise RuntimeError(f"{error_label}: {result.stderr}")
+
+        return result.stdout
+
+    def _cached_extract(
+        self,
+        url: str,
+        args: List[str],
+        error_label: str,
+        refresh: bool,
+        cancel: Optional[threading.Event] = None,
+        raise_errors: bool = False
+    ) -> Optional[Dict]:
+        """Run a -J extraction through the metadata cache"""
+        with self.tracer.span("extract", url) as span:
+            if self.cache and not refresh:
+                data = self.cache.get(url, args)
+                if data is not None:
+                    span.cache = "hit"
+                    return data
+
+            span.cache = "miss" if self.cache else None
+            try:
+                data, shared = self.inflight.do(
+                    "extract",
+                    (self._flight_url(url), tuple(args)),
+                    lambda: self._extract(url, args, error_label, cancel, span),
+                    cancel
+                )
+            except RuntimeError as e:
+                if raise_errors:
+                    raise
+                span.error = type(e).__name__
+                print(e)
+                return None
+            if shared:
+                span.cache = "shared"
+
+        # The caller whose call ran stores and indexes the result
+        if data is not None and not shared:
+            if self.cache:
+                self.cache.set(url, args, data)
+            self._index(data.get("entries") or [data])
+
+        return data
+
+    @staticmethod
+    def _flight_url(url: str) -> str:
+        """Normalize a URL for coalescing: every form of a video URL is its ID"""
+        url = url.strip()
+        return video_id_from_url(url) if classify_url(url) == "video" else url
+
+    def _index(self, entries: List[Dict]):
+        """Add fetched entries to the local search index"""
+        try:
+            self.config.index_entries(entries)
+        except Exception as e:
+            print(f"Error indexing entries: {e}")
+
+    def _popen(self, args: List[str], stderr) -> subprocess.Popen:
+        """Start yt-dlp with stdout piped for line-by-line reading"""
+        return subprocess.Popen(
+            [self.yt_dlp_cmd] + args,
+            stdout=subprocess.PIPE,
+            stderr=stderr
+        )
+
+    def fetch_json(
+        self,
+        url: str,
+        flat: bool = True,
+        extra_args: Optional[List[str]] = None,
+        refresh: bool = False,
+        cancel: Optional[threading.Event] = None,
+        raise_errors: bool = False
+    ) -> Optional[Dict]:
         """
         Fetch JSON data from yt-dlp
 
@@ -63,48 +344,34 @@ class YTDLP:
             url: URL to fetch
             flat: Use flat playlist
             extra_args: Additional arguments to pass to yt-dlp
+            refresh: Bypass the metadata cache
+            cancel: Kills yt-dlp when set
+            raise_errors: Raise RuntimeError on failure instead of printing it
 
         Returns:
             JSON data as dictionary
         """
-        cmd = [self.yt_dlp_cmd, url, "-J"]
+        args = ["-J"]
 
         if flat:
-            cmd.append("--flat-playlist")
+            args.append("--flat-playlist")
 
         # Add browser args
-        cmd.extend(self._get_browser_args())
+        args.extend(self._get_browser_args())
 
         # Add extra args
         if extra_args:
-            cmd.extend(extra_args)
-
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                shell=True
-            )
-
-            if result.returncode != 0:
-                print(f"Error fetching data: {result.stderr}")
-                return None
+            args.extend(extra_args)
 
-            return json.loads(result.stdout)
-        except json.JSONDecodeError as e:
-            print(f"Error parsing JSON: {e}")
-            return None
-        except Exception as e:
-            print(f"Error: {e}")
-            return None
+        return self._cached_extract(url, args, "Error fetching data", refresh, cancel, raise_errors)
 
     def fetch_playlist(
         self,
         url: str,
         start: int = 1,
         end: Optional[int] = None,
-        extra_args: Optional[List[str]] = None
+        extra_args: Optional[List[str]] = None,
+        refresh: bool = False
     ) -> Optional[Dict]:
         """
         Fetch playlist data
@@ -114,46 +381,199 @@ class YTDLP:
             start: Start index
             end: End index
             extra_args: Additional arguments
+            refresh: Bypass the metadata cache
 
         Returns:
             JSON data with playlist entries
         """
-        cmd = [self.yt_dlp_cmd, url, "-J", "--flat-playlist"]
+        args = ["-J", "--flat-playlist"]
 
         # Add browser args
-        cmd.extend(self._get_browser_args())
+        args.extend(self._get_browser_args())
 
         # Add playlist range
-        cmd.extend(["--playlist-start", str(start)])
+        args.extend(["--playlist-start", str(start)])
         if end:
-            cmd.extend(["--playlist-end", str(end)])
+            args.extend(["--playlist-end", str(end)])
 
         # Add extra args
         if extra_args:
-            cmd.extend(extra_args)
+            args.extend(extra_args)
 
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                shell=True
-            )
-
-            if result.returncode != 0:
-                print(f"Error fetching playlist: {result.stderr}")
-                return None
+        return self._cached_extract(url, args, "Error fetching playlist", refresh)
 
-            data = json.loads(result.stdout)
-            return data
-        except json.JSONDecodeError as e:
-            print(f"Error parsing JSON: {e}")
-            return None
-        except Exception as e:
-            print(f"Error: {e}")
-            return None
+    def _stream_lines(self, url: str, args: List[str]) -> Iterator[Dict]:
+        """
+        Run a -j extraction and yield each JSON line as it is printed
 
-    def get_video_url(self, url: str, quality: Optional[int] = None, audio_only: bool = False) -> Optional[str]:
+        Raises:
+            RuntimeError: If the extraction fails, after the entries
+                printed before the failure have been yielded
+        """
+        shared = {}
+        with self.tracer.span("stream", url) as span:
+            if self.engine:
+                try:
+                    for entry in self.engine.iter_entries(url, args):
+                        if span.ttfb is None:
+                            span.ttfb = span.since_start()
+                        yield slim_entry(entry, shared)
+                except Exception as e:
+                    raise RuntimeError(f"Error fetching playlist: {e}") from e
+                return
+
+            with tempfile.TemporaryFile() as stderr:
+                process = self._popen([url] + args, stderr)
+                span.stdout_bytes = 0
+                span.parse_time = 0.0
+                try:
+                    for line in process.stdout:
+                        if span.ttfb is None:
+                            span.ttfb = span.since_start()
+                        span.stdout_bytes += len(line)
+                        line = line.strip()
+                        if not line:
+                            continue
+                        parse_started = time.perf_counter()
+                        try:
+                            entry = slim_entry(loads(line), shared)
+                        except json.JSONDecodeError as e:
+                            print(f"Error parsing JSON: {e}")
+                            continue
+                        span.parse_time += time.perf_counter() - parse_started
+                        yield entry
+
+                    span.exit_code = process.wait()
+                    if span.exit_code != 0:
+                        stderr.seek(0)
+                        raise RuntimeError(
+                            f"Error fetching playlist: {stderr.read().decode('utf-8', 'replace')}"
+                        )
+                finally:
+                    # Stops the extraction when the consumer closes the generator early
+                    if process.poll() is None:
+                        process.kill()
+                        process.wait()
+                    process.stdout.close()
+
+    def stream_playlist(
+        self,
+        url: str,
+        start: int = 1,
+        end: Optional[int] = None,
+        page_size: Optional[int] = None,
+        extra_args: Optional[List[str]] = None,
+        refresh: bool = False,
+        on_window: Optional[Callable[[int, List[Dict]], None]] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream playlist entries while yt-dlp is still extracting
+
+        With page_size, the range is fetched one window of entries at a
+        time and each window is cached on its own once yt-dlp finishes it
+        successfully. A window's last entry is only yielded after that,
+        so a consumer pausing between windows leaves nothing running.
+        Ranges without an end or page_size are not cached, so memory
+        does not grow with the length of the list.
+
+        Args:
+            url: Playlist URL
+            start: Start index
+            end: End index
+            page_size: Fetch the range in windows of this many entries
+            extra_args: Additional arguments
+            refresh: Bypass the metadata cache
+            on_window: Called with the start index and entries of each
+                bounded window once it is complete
+
+        Yields:
+            Flat playlist entries in playlist order
+        """
+        base_args = ["-j", "--flat-playlist"]
+        base_args.extend(self._get_browser_args())
+        extra_args = list(extra_args or [])
+        unindexed = []
+
+        page_start = start
+        while True:
+            page_end = end
+            if page_size:
+                page_end = page_start + page_size - 1
+                if end:
+                    page_end = min(page_end, end)
+
+            args = base_args + ["--playlist-start", str(page_start)]
+            if page_end:
+                args.extend(["--playlist-end", str(page_end)])
+            args.extend(extra_args)
+
+            # Only bounded windows are cached, so at most one window is held
+            cached = self.cache.get(url, args) if self.cache and page_end and not refresh else None
+            if cached is not None:
+                page = cached.get("entries", [])
+                if on_window:
+                    on_window(page_start, page)
+                yield from page
+                count = len(page)
+            else:
+                page = [] if (self.cache or on_window) and page_end else None
+                count = 0
+                last = None
+                try:
+                    for entry in self._stream_lines(url, args):
+                        count += 1
+                        if page is not None:
+                            page.append(entry)
+                        unindexed.append(entry)
+                        if len(unindexed) >= self.INDEX_BATCH:
+                            self._index(unindexed)
+                            unindexed = []
+                        if page_end and count == page_end - page_start + 1:
+                            # Held until yt-dlp has exited and the window is cached
+                            last = entry
+                        else:
+                            yield entry
+                except RuntimeError as e:
+                    print(e)
+                    if last is not None:
+                        yield last
+                    break
+
+                if page is not None:
+                    if self.cache:
+                        self.cache.set(url, args, {"entries": page})
+                    if on_window:
+                        on_window(page_start, page)
+                if last is not None:
+                    yield last
+
+            # Continue with the next window until one comes back short
+            if not page_size or count < page_end - page_start + 1 or (end and page_end >= end):
+                break
+            page_start = page_end + 1
+
+        self._index(unindexed)
+
+    def _format_selector(self, quality: Optional[int], audio_only: bool) -> str:
+        """Get the -f selector for streaming"""
+        if audio_only:
+            return "bestaudio/best"
+        elif quality:
+            return f"best[height<={quality}]/best"
+        return "best"
+
+    def get_cached_video_url(self, url: str, quality: Optional[int] = None, audio_only: bool = False) -> Optional[str]:
+        """Get a previously resolved stream URL without running yt-dlp"""
+        return self.stream_cache.get(url, self._format_selector(quality, audio_only), audio_only)
+
+    def get_video_url(
+        self,
+        url: str,
+        quality: Optional[int] = None,
+        audio_only: bool = False,
+        timeout: Optional[int] = None,
+        raise_errors: bool = False
+    ) -> Optional[str]:
         """
         Get direct video URL for streaming
 
@@ -161,39 +581,97 @@ class YTDLP:
             url: Video URL
             quality: Maximum height (e.g., 1080 for 1080p)
             audio_only: Get audio URL only
+            timeout: Seconds to wait for yt-dlp
+            raise_errors: Raise RuntimeError on failure instead of printing it
 
         Returns:
             Direct URL to video stream
         """
-        cmd = [self.yt_dlp_cmd, url, "--get-url", "--no-warnings"]
+        format_selector = self._format_selector(quality, audio_only)
 
-        if audio_only:
-            cmd.extend(["-f", "bestaudio/best"])
-        elif quality:
-            cmd.extend(["-f", f"best[height<={quality}]/best"])
-        else:
-            cmd.extend(["-f", "best"])
+        with self.tracer.span("resolve", url) as span:
+            cached = self.stream_cache.get(url, format_selector, audio_only)
+            if cached:
+                span.cache = "hit"
+                return cached
+
+            span.cache = "miss"
+            try:
+                stream_url, shared = self.inflight.do(
+                    "resolve",
+                    (self._flight_url(url), format_selector),
+                    lambda: self._resolve_video_url(url, format_selector, timeout, span)
+                )
+            except RuntimeError as e:
+                if raise_errors:
+                    raise
+                span.error = type(e).__name__
+                print(e)
+                return None
+            if shared:
+                span.cache = "shared"
+
+        if stream_url and not shared:
+            self.stream_cache.set(url, format_selector, audio_only, stream_url)
+        return stream_url
+
+    def _resolve_video_url(
+        self,
+        url: str,
+        format_selector: str,
+        timeout: Optional[int],
+        span: Optional[TraceSpan] = None
+    ) -> Optional[str]:
+        """
+        Resolve a stream URL with the active backend
+
+        Raises:
+            RuntimeError: If resolution fails, with a message for the user
+        """
+        args = ["--get-url", "--no-warnings", "-f", format_selector]
 
         # Add browser args
-        cmd.extend(self._get_browser_args())
+        args.extend(self._get_browser_args())
 
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                shell=True
-            )
-
-            if result.returncode != 0:
-                return None
+        if self.engine:
+            try:
+                return self.engine.resolve_url(url, args, timeout=timeout)
+            except Exception as e:
+                raise RuntimeError(f"Error getting video URL: {e}") from e
 
-            # Return the last line (best quality)
-            urls = result.stdout.strip().split("\n")
-            return urls[-1] if urls else None
+        try:
+            result = self._run([url] + args, timeout=timeout, span=span)
+        except subprocess.TimeoutExpired as e:
+            raise RuntimeError("Timeout resolving video URL") from e
         except Exception as e:
-            print(f"Error getting video URL: {e}")
-            return None
+            raise RuntimeError(f"Error getting video URL: {e}") from e
+
+        if result.returncode != 0:
+            raise RuntimeError(f"Error getting video URL: {result.stderr.strip()}")
+
+        # Return the last line (best quality)
+        urls = result.stdout.strip().split("\n")
+        return urls[-1] if urls else None
+
+    def download_command(
+        self,
+        url: str,
+        output_template: str,
+        audio_only: bool = False,
+        extra_args: Optional[List[str]] = None
+    ) -> List[str]:
+        """Build the yt-dlp command for a download"""
+        cmd = [self.yt_dlp_cmd, url, "-o", output_template]
+
+        if audio_only:
+            cmd.extend(["-x", "-f", "bestaudio", "--audio-format", "mp3"])
+        elif extra_args:
+            cmd.extend(extra_args)
+
+        # Add browser args
+        cmd.extend(self._get_browser_args())
+
+        return cmd
 
     def download(
         self,
@@ -203,7 +681,9 @@ class YTDLP:
         extra_args: Optional[List[str]] = None
     ) -> bool:
         """
-        Download video/audio
+        Download video/audio, blocking until done
+
+        The TUI uses DownloadQueue instead.
 
         Args:
             url: URL to download
@@ -214,43 +694,104 @@ class YTDLP:
         Returns:
             True if successful
         """
-        cmd = [self.yt_dlp_cmd, url, "-o", output_template]
+        cmd = self.download_command(url, output_template, audio_only, extra_args)
 
-        if audio_only:
-            cmd.extend(["-x", "-f", "bestaudio", "--audio-format", "mp3"])
-        elif extra_args:
-            cmd.extend(extra_args)
+        with self.tracer.span("download", url) as span:
+            try:
+                subprocess.run(cmd, check=True)
+                span.exit_code = 0
+                return True
+            except subprocess.CalledProcessError as e:
+                span.exit_code = e.returncode
+                print(f"Download failed: {e}")
+                return False
+
+    def get_thumbnail(self, url: str, video: Optional[Dict] = None) -> Optional[str]:
+        """
+        Get thumbnail URL for video
 
-        # Add browser args
-        cmd.extend(self._get_browser_args())
+        Args:
+            url: Video URL
+            video: Flat entry for the video, if already fetched
+
+        Returns:
+            Thumbnail URL
+        """
+        from .thumbnails import thumbnail_url
+
+        # Flat entries and YouTube IDs are enough, no page extraction needed
+        thumbnail = thumbnail_url(dict(video or {}, url=url))
+        if thumbnail:
+            return thumbnail
 
-        try:
-            subprocess.run(cmd, check=True, shell=True)
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"Download failed: {e}")
-            return False
-
-    def get_thumbnail(self, url: str) -> Optional[str]:
-        """Get thumbnail URL for video"""
         data = self.fetch_json(url, flat=False)
         if not data:
             return None
 
-        try:
-            thumbnails = data.get("thumbnails", [])
-            if thumbnails:
-                return thumbnails[-1].get("url")
-        except (KeyError, IndexError):
-            pass
+        return data.get("thumbnail")
 
-        return None
+    def search_url(self, query: str, filters: Optional[str] = None) -> str:
+        """Build the YouTube results URL for a query"""
+        url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(query.strip())}"
+        if filters:
+            url += f"&sp={filters}"
+        return url
+
+    def stream_search(
+        self,
+        query: str,
+        filters: Optional[str] = None,
+        start: int = 1,
+        page_size: Optional[int] = None,
+        refresh: bool = False
+    ) -> Iterator[Dict]:
+        """
+        Stream search results while yt-dlp is still extracting
+
+        Each window is appended to the search result cache once yt-dlp
+        has finished it, so later searches for the query reuse the
+        results and can carry on from where they stop.
+
+        Args:
+            query: Search query
+            filters: YouTube search filters (sp parameter)
+            start: Index of the first result, e.g. one past the cached ones
+            page_size: Fetch results in windows of this many entries
+            refresh: Bypass the metadata cache
+
+        Yields:
+            Search result entries
+        """
+        def store(window_start: int, entries: List[Dict]):
+            # A short window is the last one
+            complete = len(entries) < page_size
+            if window_start == 1:
+                self.search_cache.set(query, filters, entries, complete)
+                return
+
+            # Only extend a stored list that ends right before this window
+            found = self.search_cache.lookup(query, filters)
+            if found and not found[1] and len(found[0]) == window_start - 1:
+                self.search_cache.set(query, filters, found[0] + entries, complete)
+
+        # Same URL for every spelling of the query, as in search()
+        url = self.search_url(normalize_query(query), filters)
+        return self.stream_playlist(
+            url,
+            start=start,
+            page_size=page_size,
+            refresh=refresh,
+            on_window=store if page_size else None
+        )
 
     def search(
         self,
         query: str,
         filters: Optional[str] = None,
-        max_results: Optional[int] = None
+        max_results: Optional[int] = None,
+        refresh: bool = False,
+        cancel: Optional[threading.Event] = None,
+        raise_errors: bool = False
     ) -> Optional[List[Dict]]:
         """
         Search YouTube
@@ -259,24 +800,25 @@ class YTDLP:
             query: Search query
             filters: YouTube search filters (sp parameter)
             max_results: Maximum number of results
+            refresh: Bypass the result caches
+            cancel: Kills yt-dlp when set, e.g. because the query changed
+            raise_errors: Raise RuntimeError on failure instead of printing it
 
         Returns:
             List of video entries
         """
-        # Encode query for URL
-        import urllib.parse
-        encoded_query = urllib.parse.quote(query)
+        entries = None if refresh else self.search_cache.get(query, filters)
 
-        url = f"https://www.youtube.com/results?search_query={encoded_query}"
-        if filters:
-            url += f"&sp={filters}"
-
-        data = self.fetch_json(url, flat=True)
+        if entries is None:
+            # Same URL for every spelling of the query, so the disk cache is shared too
+            url = self.search_url(normalize_query(query), filters)
+            data = self.fetch_json(url, flat=True, refresh=refresh, cancel=cancel, raise_errors=raise_errors)
 
-        if not data:
-            return None
+            if not data:
+                return None
 
-        entries = data.get("entries", [])
+            entries = data.get("entries", [])
+            self.search_cache.set(query, filters, entries)
 
         if max_results:
             entries = entries[:max_results]